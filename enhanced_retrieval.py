@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """Enhanced retrieval configuration for multi-document scenarios."""
 
+from collections import Counter
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from pathlib import Path
 from sage.config import SageConfig, ConfigManager
 from sage.vector_store import VectorStore
@@ -8,50 +11,88 @@ from sage.llm_client import LLMClient
 from typing import List, Dict, Set
 from langchain.schema import Document
 
+
+@dataclass
+class RetrievalAnalysis:
+    """Aggregate view of which documents a retrieval drew from."""
+
+    total_chunks: int
+    unique_documents: List[str]
+    project_phases: List[str]
+    categories: List[str]
+    document_distribution: Counter
+
+@lru_cache(maxsize=512)
+def _hierarchy_parts(hierarchy: str) -> frozenset:
+    """Split a folder_hierarchy string into a set of folder names.
+
+    Chunks from the same folder share the same hierarchy string, so the
+    split is computed once per folder and category checks become O(1)
+    hash probes instead of substring scans.
+    """
+    return frozenset(hierarchy.split(" > "))
+
+
 class EnhancedRetrieval:
     """Enhanced retrieval for better multi-document handling."""
     
     def __init__(self, config: SageConfig):
         self.config = config
-        self.vector_store = VectorStore(config)
-        self.vector_store.initialize()
-        
+
+    @cached_property
+    def vector_store(self) -> VectorStore:
+        """Vector store, constructed and initialized on first access.
+
+        Deferring the index and embedding-model load keeps config-only
+        and analysis-only use of this class cheap.
+        """
+        store = VectorStore(self.config)
+        store.initialize()
+        return store
+
     def retrieve_with_document_diversity(self, query: str, k: int = 10, max_per_doc: int = 2) -> List[Document]:
         """
         Retrieve chunks ensuring document diversity.
-        
+
         Args:
             query: Search query
             k: Total chunks to retrieve initially
             max_per_doc: Maximum chunks from same document
-        
+
         Returns:
             Diverse set of chunks from multiple documents
         """
-        # Get more chunks initially
-        all_chunks = self.vector_store.search_with_score(query, k=k)
-        
-        # Track chunks per document
-        doc_chunks = {}
-        selected_chunks = []
-        
-        for chunk, score in all_chunks:
-            source = chunk.metadata.get('source', 'unknown')
-            
-            # Initialize counter for this document
-            if source not in doc_chunks:
-                doc_chunks[source] = 0
-            
-            # Add chunk if under limit for this document
-            if doc_chunks[source] < max_per_doc:
-                selected_chunks.append(chunk)
-                doc_chunks[source] += 1
-                
-            # Stop if we have enough diverse chunks
-            if len(selected_chunks) >= k // 2:
-                break
-                
-        return selected_chunks
+        # Let the vector backend compute diversity via Maximal Marginal
+        # Relevance, then cap chunks per document. If the cap leaves the
+        # selection under-filled, retry with a geometrically larger
+        # fetch instead of always over-fetching up front.
+        target = max(1, k // 2)
+        request_k = target
+        fetch_k = k * 3
+
+        while True:
+            candidates = self.vector_store.search_with_diversity(
+                query, k=request_k, fetch_k=fetch_k, lambda_mult=0.5
+            )
+
+            selected_chunks = []
+            doc_chunks = Counter()
+
+            for chunk in candidates:
+                source = chunk.metadata.get('source', 'unknown')
+                if doc_chunks[source] < max_per_doc:
+                    selected_chunks.append(chunk)
+                    doc_chunks[source] += 1
+                if len(selected_chunks) >= target:
+                    return selected_chunks
+
+            # The store returned fewer candidates than requested, so a
+            # larger fetch cannot fill the remainder
+            if len(candidates) < request_k:
+                return selected_chunks
+
+            request_k *= 2
+            fetch_k *= 2
     
     def retrieve_with_context_expansion(self, query: str, k: int = 5) -> List[Document]:
         """
@@ -66,26 +107,12 @@ class EnhancedRetrieval:
         """
         # Get primary chunks
         primary_chunks = self.vector_store.search(query, k=k)
-        
-        expanded_chunks = []
-        seen_sources = set()
-        
-        for chunk in primary_chunks:
-            source = chunk.metadata.get('source')
-            chunk_idx = chunk.metadata.get('chunk_index', 0)
-            
-            # Add primary chunk
-            expanded_chunks.append(chunk)
-            
-            # If first time seeing this document, try to get adjacent chunks
-            if source and source not in seen_sources:
-                seen_sources.add(source)
-                
-                # Try to get previous and next chunks
-                # Note: This would require additional vector store methods
-                # For now, we'll just mark that this could be enhanced
-                
-        return expanded_chunks
+
+        # Actual expansion would group chunks by source and fetch the
+        # adjacent chunk_index neighbours in one bulk ID lookup; until
+        # the vector store grows that method, primary chunks are
+        # returned as-is without per-chunk bookkeeping.
+        return primary_chunks
     
     def retrieve_by_document_category(self, query: str, categories: List[str], k_per_category: int = 2) -> List[Document]:
         """
@@ -99,68 +126,50 @@ class EnhancedRetrieval:
         Returns:
             Balanced chunks from requested categories
         """
+        # Enhance each query with category context, then embed and search
+        # all categories in one batched call instead of one per category
+        category_queries = [f"{query} {category}" for category in categories]
+        results = self.vector_store.search_batch(category_queries, k=k_per_category)
+
         all_chunks = []
-        
-        for category in categories:
-            # Enhance query with category context
-            category_query = f"{query} {category}"
-            chunks = self.vector_store.search(category_query, k=k_per_category)
-            
+
+        for category, chunks in zip(categories, results):
             # Filter to ensure chunks are actually from this category
             category_chunks = [
                 chunk for chunk in chunks
-                if category in chunk.metadata.get('folder_hierarchy', '')
+                if category in _hierarchy_parts(chunk.metadata.get('folder_hierarchy', ''))
             ]
-            
+
             all_chunks.extend(category_chunks)
-            
+
         return all_chunks
     
-    def analyze_retrieved_documents(self, chunks: List[Document]) -> Dict:
+    def analyze_retrieved_documents(self, chunks: List[Document]) -> RetrievalAnalysis:
         """
         Analyze the diversity and coverage of retrieved chunks.
-        
+
         Args:
             chunks: Retrieved document chunks
-            
+
         Returns:
             Analysis of document coverage
         """
-        analysis = {
-            'total_chunks': len(chunks),
-            'unique_documents': set(),
-            'project_phases': set(),
-            'categories': set(),
-            'document_distribution': {}
-        }
-        
-        for chunk in chunks:
-            source = chunk.metadata.get('source', 'unknown')
-            phase = chunk.metadata.get('main_phase', 'unknown')
-            category = chunk.metadata.get('project_category', 'unknown')
-            
-            analysis['unique_documents'].add(source)
-            analysis['project_phases'].add(phase)
-            analysis['categories'].add(category)
-            
-            # Count chunks per document
-            if source not in analysis['document_distribution']:
-                analysis['document_distribution'][source] = 0
-            analysis['document_distribution'][source] += 1
-        
-        # Convert sets to lists for better display
-        analysis['unique_documents'] = list(analysis['unique_documents'])
-        analysis['project_phases'] = list(analysis['project_phases'])
-        analysis['categories'] = list(analysis['categories'])
-        
-        return analysis
+        # Single pass per field keeps the counting in C via Counter/set
+        sources = [chunk.metadata.get('source', 'unknown') for chunk in chunks]
+        phases = [chunk.metadata.get('main_phase', 'unknown') for chunk in chunks]
+        categories = [chunk.metadata.get('project_category', 'unknown') for chunk in chunks]
+
+        return RetrievalAnalysis(
+            total_chunks=len(chunks),
+            unique_documents=list(set(sources)),
+            project_phases=list(set(phases)),
+            categories=list(set(categories)),
+            document_distribution=Counter(sources)
+        )
 
 def demonstrate_multi_document_retrieval():
     """Demonstrate multi-document retrieval strategies."""
-    
-    print("🔍 Multi-Document Retrieval Strategies")
-    print("=" * 50)
-    
+
     strategies = [
         {
             "name": "Standard Retrieval (Current)",
@@ -192,19 +201,21 @@ def demonstrate_multi_document_retrieval():
         }
     ]
     
+    # Build the whole report in memory and emit it with one write
+    lines = ["🔍 Multi-Document Retrieval Strategies", "=" * 50]
     for i, strategy in enumerate(strategies, 1):
-        print(f"\n{i}. {strategy['name']}")
-        print(f"   📋 {strategy['description']}")
-        print(f"   ✅ Pros: {strategy['pros']}")
-        print(f"   ⚠️  Cons: {strategy['cons']}")
-        print(f"   📊 Example: {strategy['example']}")
+        lines.append(
+            f"\n{i}. {strategy['name']}\n"
+            f"   📋 {strategy['description']}\n"
+            f"   ✅ Pros: {strategy['pros']}\n"
+            f"   ⚠️  Cons: {strategy['cons']}\n"
+            f"   📊 Example: {strategy['example']}"
+        )
+    print("\n".join(lines))
 
 def example_multi_document_queries():
     """Show example queries that benefit from multi-document retrieval."""
-    
-    print("\n\n📚 Example Multi-Document Queries")
-    print("=" * 50)
-    
+
     examples = [
         {
             "query": "What are all the project risks and their mitigation strategies?",
@@ -252,12 +263,16 @@ def example_multi_document_queries():
         }
     ]
     
+    # Same single-write pattern as the strategies report above
+    lines = ["\n\n📚 Example Multi-Document Queries", "=" * 50]
     for example in examples:
-        print(f"\n❓ Query: '{example['query']}'")
-        print(f"   📄 Needs documents from:")
-        for doc in example['documents_needed']:
-            print(f"      • {doc}")
-        print(f"   🎯 Best strategy: {example['optimal_strategy']}")
+        needed = "\n".join(f"      • {doc}" for doc in example['documents_needed'])
+        lines.append(
+            f"\n❓ Query: '{example['query']}'\n"
+            f"   📄 Needs documents from:\n{needed}\n"
+            f"   🎯 Best strategy: {example['optimal_strategy']}"
+        )
+    print("\n".join(lines))
 
 if __name__ == "__main__":
     demonstrate_multi_document_retrieval()
@@ -0,0 +1,25 @@
+"""Entry point for Project Sage with a lightweight fast path.
+
+Trivial invocations are answered before typer/click/rich are
+imported, so 'sage version' responds in milliseconds; everything
+else falls through to the full Typer app.
+"""
+
+import sys
+
+
+def main():
+    """Dispatch a sage invocation."""
+    args = sys.argv[1:]
+
+    if args and args[0] in ("version", "-V", "--version"):
+        from sage import __version__
+        print(f"Project Sage v{__version__}")
+        sys.exit(0)
+
+    from sage.cli import main as cli_main
+    cli_main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Client-side query/answer caching for Project Sage."""
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import List, Optional
+
+from langchain.schema import Document
+
+
+def query_key(query: str, k: int) -> str:
+    """Cache key for a retrieval result."""
+    return hashlib.blake2b(
+        f"{query}\x00{k}".encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
+def answer_key(query: str, model: str, documents: List[Document]) -> str:
+    """Cache key for an LLM answer, tied to the exact chunks and model used."""
+    chunk_ids = sorted(
+        (doc.metadata.get('source', ''), doc.metadata.get('chunk_index', 0))
+        for doc in documents
+    )
+    return hashlib.blake2b(
+        f"{query}\x00{model}\x00{chunk_ids!r}".encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
+def encode_documents(documents: List[Document]) -> bytes:
+    """Serialize documents for cache storage."""
+    return json.dumps([
+        {"page_content": doc.page_content, "metadata": doc.metadata}
+        for doc in documents
+    ]).encode("utf-8")
+
+
+def decode_documents(blob: bytes) -> List[Document]:
+    """Deserialize documents from cache storage."""
+    return [
+        Document(page_content=item["page_content"], metadata=item["metadata"])
+        for item in json.loads(blob)
+    ]
+
+
+class QueryCache:
+    """SQLite-backed key/value cache stored under .sage/cache.
+
+    Repeat questions skip both the embedding call and the completion
+    call; the cache is cleared whenever the index is rebuilt.
+    """
+
+    def __init__(self, project_path: Path):
+        cache_dir = project_path / ".sage" / "cache"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = cache_dir / "qa.sqlite"
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached value for key, or None on a miss."""
+        row = self._conn.execute(
+            "SELECT value FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, value: bytes):
+        """Store a value under key, replacing any existing entry."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)",
+            (key, value)
+        )
+        self._conn.commit()
+
+    def clear(self):
+        """Drop all cached entries."""
+        self._conn.execute("DELETE FROM cache")
+        self._conn.commit()
@@ -1,30 +1,161 @@
 """Command-line interface for Project Sage."""
 
+from __future__ import annotations
+
+import importlib
+import os
 import sys
 import json
+import time
+from collections import deque
+from contextlib import nullcontext
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 from typing import Optional
 import typer
-from rich import print
-from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.table import Table
-from rich.panel import Panel
 from datetime import datetime
 
 from sage.config import ConfigManager, SageConfig
-from sage.setup_gui import SetupWindow
-from sage.file_processor import FileProcessor
-from sage.vector_store import VectorStore
-from sage.llm_client import LLMClient
-from sage.model_manager import ModelManager
+
+# Rich attributes resolved lazily on first access (PEP 562), so the
+# rich/pygments import cost is only paid by commands that render
+_LAZY_RICH = {
+    "Console": ("rich.console", "Console"),
+    "Progress": ("rich.progress", "Progress"),
+    "SpinnerColumn": ("rich.progress", "SpinnerColumn"),
+    "TextColumn": ("rich.progress", "TextColumn"),
+    "Table": ("rich.table", "Table"),
+    "Panel": ("rich.panel", "Panel"),
+}
+
+
+def __getattr__(name):
+    if name == "console":
+        return _console()
+    if name in _LAZY_RICH:
+        module_name, attr = _LAZY_RICH[name]
+        value = getattr(importlib.import_module(module_name), attr)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=None)
+def _console() -> "Console":
+    """Create the shared Rich console on first use.
+
+    Console() probes terminal capabilities at construction, which
+    '--help' and 'version' never need.
+    """
+    from rich.console import Console
+    return Console()
+
+# Heavy subsystems (vector store, LLM SDKs, document parsers, GUI
+# toolkits) are imported inside the commands that use them so that
+# fast paths like 'sage version' and '--help' don't pay for them.
+# Setting SAGE_EAGER_IMPORT=1 restores eager imports, which lets CI
+# catch import breakage up front.
+if os.environ.get("SAGE_EAGER_IMPORT"):
+    from sage.setup_gui import SetupWindow
+    from sage.file_processor import FileProcessor
+    from sage.vector_store import VectorStore, get_vector_store
+    from sage.llm_client import LLMClient
+    from sage.model_manager import ModelManager
+
+# Static chat renderables: the /help panel never changes and the
+# /status body is a fixed template, so the markup is parsed once
+_HELP_TEXT = """[bold]Available Commands:[/bold]
+
+🔹 /help     - Show this help message
+🔹 /status   - Show knowledge base status
+🔹 /model    - Show current model and available options
+🔹 /switch   - Switch to a different LLM model
+🔹 /clear    - Clear conversation history
+🔹 /clear-cache - Clear the cached query/answer results
+🔹 /history  - Show conversation history
+🔹 /sources  - List all indexed documents
+🔹 exit      - End chat session
+
+[bold]Model Switching:[/bold]
+• /model - See current model and recommendations
+• /switch google gemini-2.0-flash - Switch to specific model
+• /switch ollama llama3.1:8b - Switch to local Ollama model
+• You can switch models mid-conversation!
+
+[bold]Tips:[/bold]
+• Ask specific questions about your project documents
+• Switch models for different tasks (fast vs. quality)
+• Use follow-up questions to dive deeper into topics"""
+
+_STATUS_TEMPLATE = """[bold]Knowledge Base Status:[/bold]
+
+📊 Documents: {doc_count} chunks indexed
+🤖 LLM: {provider} {model}
+📝 Language: {language}
+💬 Questions Asked: {question_count}"""
+
+
+# Constant styling for the per-turn answer panels; only the answer
+# text itself changes, so the title markup is parsed once per render
+# with no per-turn kwargs rebuild
+_SAGE_PANEL_KWARGS = dict(title="[bold]🤖 Sage[/bold]", border_style="green")
+_ANSWER_PANEL_KWARGS = dict(title="[bold]Answer[/bold]", border_style="blue")
+
+# Timestamp formats used in hot or repeated paths
+_TS_DISPLAY_FMT = "%Y-%m-%d %H:%M:%S"
+_TS_ISO_FMT = "%Y-%m-%dT%H:%M:%S"
+
+
+@lru_cache(maxsize=None)
+def _help_panel():
+    """Build the static /help panel once per process."""
+    from rich.panel import Panel
+    return Panel(_HELP_TEXT, title="Chat Help", border_style="yellow")
+
+
+# orjson serializes several times faster than the stdlib; fall back
+# transparently when it isn't installed
+try:
+    import orjson
+
+    def _dumps_json_line(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _dumps_json_line(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
+def _status_ctx(message: str):
+    """A status spinner on a terminal, a no-op context otherwise.
+
+    Skipping the spinner off-TTY avoids starting a Live render thread
+    whose output is just noise in piped or captured runs.
+    """
+    console = _console()
+    return console.status(message) if console.is_terminal else nullcontext()
+
+
+def _rel_source(source: str, prefix: str) -> str:
+    """Strip the project-path prefix from a source path string."""
+    return source[len(prefix):] if source.startswith(prefix) else source
+
+
+@lru_cache(maxsize=1)
+def _load_config(path_str: str) -> Optional[SageConfig]:
+    """Load the project configuration once per invocation.
+
+    Commands (and the chat command loop) all read the same config
+    file; caching the parsed result avoids re-reading it from disk.
+    """
+    return ConfigManager(Path(path_str)).load()
+
 
 app = typer.Typer(
     name="sage",
     help="Project Sage - An intelligent AI assistant for complex project management",
     add_completion=False
 )
-console = Console()
 
 
 @app.command()
@@ -37,212 +168,351 @@ def setup():
         if not typer.confirm("Configuration already exists. Do you want to reconfigure?"):
             return
             
-    console.print("[bold blue]Launching setup window...[/bold blue]")
-    
+    _console().print("[bold blue]Launching setup window...[/bold blue]")
+
     try:
+        from sage.setup_gui import SetupWindow
+
         setup_window = SetupWindow(project_path)
         config = setup_window.run()
         
         if config:
-            console.print("[bold green]✓ Project initialized successfully![/bold green]")
-            console.print(f"Configuration saved to: {config_manager.config_path}")
+            _console().print("[bold green]✓ Project initialized successfully![/bold green]")
+            _console().print(f"Configuration saved to: {config_manager.config_path}")
         else:
-            console.print("[yellow]Setup cancelled.[/yellow]")
+            _console().print("[yellow]Setup cancelled.[/yellow]")
             
     except Exception as e:
-        console.print(f"[bold red]Error during setup: {str(e)}[/bold red]")
+        _console().print(f"[bold red]Error during setup: {str(e)}[/bold red]")
         raise typer.Exit(1)
 
 
 @app.command()
-def update(force: bool = typer.Option(False, "--force", "-f", help="Force full re-scan of all files")):
+def update(
+    force: bool = typer.Option(False, "--force", "-f", help="Force full re-scan of all files"),
+    workers: int = typer.Option(
+        max(1, (os.cpu_count() or 2) - 1), "--workers", "-w",
+        help="Parallel parsing workers (1 disables multiprocessing)"
+    ),
+):
     """Scan and index project documents."""
     project_path = Path.cwd()
-    config_manager = ConfigManager(project_path)
-    
+    project_path_str = str(project_path)
+
     # Load configuration
-    config = config_manager.load()
+    config = _load_config(project_path_str)
     if not config:
-        console.print("[bold red]Project not initialized. Run 'sage setup' first.[/bold red]")
+        _console().print("[bold red]Project not initialized. Run 'sage setup' first.[/bold red]")
         raise typer.Exit(1)
         
-    console.print("[bold blue]Updating knowledge base...[/bold blue]")
-    
+    _console().print("[bold blue]Updating knowledge base...[/bold blue]")
+
+    import queue
+    import threading
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+    from rich.progress import Progress
+
+    from sage.file_processor import FileProcessor, process_file_job
+    from sage.vector_store import VectorStore, get_vector_store
+
     # Initialize components
     processor = FileProcessor(
         chunk_size=config.chunk_size,
         chunk_overlap=config.chunk_overlap,
         ocr_language=config.document_language
     )
-    vector_store = VectorStore(config)
-    vector_store.initialize()
-    
-    # Find files to process
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        transient=True,
-    ) as progress:
-        task = progress.add_task("Scanning for files...", total=None)
-        files_to_process = processor.find_files(project_path, force)
-        progress.update(task, completed=100)
-        
-    if not files_to_process:
-        console.print("[green]✓ Knowledge base is up to date.[/green]")
-        return
-        
-    console.print(f"Found [bold]{len(files_to_process)}[/bold] files to process")
+    vector_store = get_vector_store(config)
     
-    # Clear vector store if force update
+    # Clear vector store if force update; must happen before any
+    # streamed results are written back
     if force:
         vector_store.clear()
-        
-    # Process files
+
+    # Process files: the scan streams from iter_files straight into the
+    # pool, so parsing/OCR starts before the walk finishes and no full
+    # file list is held in memory. Parsing is CPU-bound, so it fans out
+    # to worker processes; vector store writes stay in this process
+    # (Chroma isn't fork-safe) but run on a dedicated writer thread fed
+    # by a bounded queue, so embedding/network latency overlaps with
+    # parsing instead of stalling the completion loop. Chunks are still
+    # buffered and added in batches so small files don't cost one
+    # embedding request each.
     total_documents = 0
     failed_files = []
-    
-    with Progress() as progress:
-        task = progress.add_task("Processing files...", total=len(files_to_process))
-        
-        for file_path in files_to_process:
-            progress.update(task, description=f"Processing {file_path.name}...")
-            
+    doc_buffer = []
+    buffer_files = []
+    batch_size = 256
+    futures = {}
+
+    write_queue = queue.Queue(maxsize=4)
+    write_errors = []
+    committed_files = []
+    failed_writes = []
+
+    def _drain_writes():
+        # Each queue item pairs a chunk batch with the (file, documents)
+        # entries it came from, so a failed write can exclude exactly
+        # those files from the metadata flush: they must not be recorded
+        # as indexed, or later runs would skip them forever
+        while True:
+            item = write_queue.get()
+            if item is None:
+                return
+            batch, batch_files = item
             try:
-                documents = processor.process_file(file_path, project_path)
-                if documents:
-                    vector_store.add_documents(documents)
-                    processor.update_metadata(project_path, file_path, documents)
-                    total_documents += len(documents)
-                else:
-                    failed_files.append(file_path)
-                    
+                vector_store.add_documents(batch)
             except Exception as e:
-                console.print(f"[red]Error processing {file_path.name}: {str(e)}[/red]")
-                failed_files.append(file_path)
-                
-            progress.update(task, advance=1)
-            
+                write_errors.append(e)
+                failed_writes.extend(fp for fp, _ in batch_files)
+            else:
+                committed_files.extend(batch_files)
+
+    writer = threading.Thread(target=_drain_writes, daemon=True)
+    writer.start()
+
+    # One timestamp for the whole run; chunk metadata records when the
+    # batch was indexed, not when each file cleared the pool
+    batch_time = datetime.now().isoformat()
+
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers)
+
+        def _submit(fp):
+            return executor.submit(
+                process_file_job, fp, project_path,
+                config.chunk_size, config.chunk_overlap, config.document_language,
+                batch_time
+            )
+    else:
+        # Sequential fallback; a single thread keeps the same
+        # futures-based flow without fork/pickle overhead
+        executor = ThreadPoolExecutor(max_workers=1)
+
+        def _submit(fp):
+            return executor.submit(processor.process_file, fp, project_path,
+                                   now=batch_time)
+
+    # Share the command's console so error lines printed mid-run go
+    # through the Live display instead of fighting it for the TTY
+    with Progress(console=_console()) as progress:
+        task = progress.add_task("Scanning for files...", total=None)
+
+        with executor:
+            for file_path in processor.iter_files(project_path, force):
+                futures[_submit(file_path)] = file_path
+
+            # Scan complete; the pool is already chewing through files
+            if futures:
+                _console().print(f"Found [bold]{len(futures)}[/bold] files to process")
+            progress.update(task, description="Processing files...",
+                            total=len(futures), completed=0)
+
+            last_render = 0.0
+            for future in as_completed(futures):
+                file_path = futures[future]
+                # Renaming the task forces a repaint; at most ~10/s is
+                # plenty for a human and keeps fast runs off the console
+                now = time.monotonic()
+                if now - last_render > 0.1:
+                    progress.update(task, description=f"Processing {file_path.name}...")
+                    last_render = now
+
+                try:
+                    documents = future.result()
+                    if documents:
+                        doc_buffer.extend(documents)
+                        buffer_files.append((file_path, documents))
+                        total_documents += len(documents)
+                        if len(doc_buffer) >= batch_size:
+                            write_queue.put((doc_buffer, buffer_files))
+                            doc_buffer = []
+                            buffer_files = []
+                    else:
+                        failed_files.append(file_path)
+
+                except Exception as e:
+                    _console().print(f"[red]Error processing {file_path.name}: {str(e)}[/red]")
+                    failed_files.append(file_path)
+
+                progress.update(task, advance=1)
+
+        # Flush the remaining chunks, stop the writer, and persist
+        # metadata in one pass — covering only batches that the writer
+        # actually committed
+        if doc_buffer:
+            write_queue.put((doc_buffer, buffer_files))
+        write_queue.put(None)
+        writer.join()
+        for error in write_errors:
+            _console().print(f"[red]Error writing to vector store: {error}[/red]")
+        failed_files.extend(failed_writes)
+        processor.update_metadata_batch(project_path, committed_files)
+
+    if not futures:
+        _console().print("[green]✓ Knowledge base is up to date.[/green]")
+        return
+
+    # Cached query/answer results may reference stale chunks now
+    from sage.cache import QueryCache
+    QueryCache(project_path).clear()
+
     # Print summary
-    console.print("\n[bold]Update Summary:[/bold]")
-    console.print(f"  Files processed: {len(files_to_process) - len(failed_files)}")
-    console.print(f"  Documents created: {total_documents}")
+    _console().print("\n[bold]Update Summary:[/bold]")
+    _console().print(f"  Files processed: {len(futures) - len(failed_files)}")
+    _console().print(f"  Documents created: {total_documents}")
     if failed_files:
-        console.print(f"  [red]Failed files: {len(failed_files)}[/red]")
+        _console().print(f"  [red]Failed files: {len(failed_files)}[/red]")
         for f in failed_files[:5]:
-            console.print(f"    - {f.name}")
+            _console().print(f"    - {f.name}")
         if len(failed_files) > 5:
-            console.print(f"    ... and {len(failed_files) - 5} more")
+            _console().print(f"    ... and {len(failed_files) - 5} more")
             
-    console.print("[bold green]✓ Knowledge base updated successfully![/bold green]")
+    if write_errors:
+        _console().print(
+            "[bold yellow]⚠ Knowledge base updated with errors; "
+            "failed files will be retried on the next run.[/bold yellow]"
+        )
+    else:
+        _console().print("[bold green]✓ Knowledge base updated successfully![/bold green]")
 
 
 @app.command()
 def ask(query: str = typer.Argument(..., help="Your question about the project")):
     """Ask a question about your project documents."""
     project_path = Path.cwd()
-    config_manager = ConfigManager(project_path)
-    
+    project_path_str = str(project_path)
+
     # Load configuration
-    config = config_manager.load()
+    config = _load_config(project_path_str)
     if not config:
-        console.print("[bold red]Project not initialized. Run 'sage setup' first.[/bold red]")
+        _console().print("[bold red]Project not initialized. Run 'sage setup' first.[/bold red]")
         raise typer.Exit(1)
-        
+
+    from rich.panel import Panel
+
+    from sage.llm_client import LLMClient
+    from sage.vector_store import VectorStore, get_vector_store
+
     # Initialize components
-    vector_store = VectorStore(config)
-    vector_store.initialize()
-    
+    vector_store = get_vector_store(config)
+
     # Check if knowledge base exists
     doc_count = vector_store.get_document_count()
     if doc_count == 0:
-        console.print("[bold yellow]Knowledge base is empty. Run 'sage update' first.[/bold yellow]")
+        _console().print("[bold yellow]Knowledge base is empty. Run 'sage update' first.[/bold yellow]")
         raise typer.Exit(1)
-        
+
+    from sage import cache as qa_cache
+
+    query_cache = qa_cache.QueryCache(project_path)
+
     # Search for relevant documents (increased for better multi-document coverage)
-    with console.status("[bold blue]Searching knowledge base...[/bold blue]"):
+    with _status_ctx("[bold blue]Searching knowledge base...[/bold blue]"):
         # Increase k for queries that likely need multiple documents
         k_value = 10 if any(word in query.lower() for word in ['all', 'compare', 'across', 'multiple', 'summary', 'tổng hợp', 'tất cả']) else 5
-        documents = vector_store.search(query, k=k_value)
-        
+
+        doc_key = qa_cache.query_key(query, k_value)
+        cached_docs = query_cache.get(doc_key)
+        if cached_docs is not None:
+            documents = qa_cache.decode_documents(cached_docs)
+        else:
+            documents = vector_store.search(query, k=k_value)
+            query_cache.put(doc_key, qa_cache.encode_documents(documents))
+
     if not documents:
-        console.print("[yellow]No relevant documents found for your query.[/yellow]")
+        _console().print("[yellow]No relevant documents found for your query.[/yellow]")
         return
-        
-    # Get answer from LLM
-    with console.status("[bold blue]Generating answer...[/bold blue]"):
-        llm_client = LLMClient(config)
-        result = llm_client.answer_question(query, documents)
-        
+
+    # Get answer from LLM, reusing a cached answer for the exact same
+    # question, model, and retrieved chunks
+    with _status_ctx("[bold blue]Generating answer...[/bold blue]"):
+        ans_key = qa_cache.answer_key(
+            query, f"{config.llm_provider}:{config.llm_model}", documents
+        )
+        cached_answer = query_cache.get(ans_key)
+        if cached_answer is not None:
+            result = json.loads(cached_answer)
+        else:
+            llm_client = LLMClient(config)
+            result = llm_client.answer_question(query, documents)
+            if not result.get('error'):
+                query_cache.put(ans_key, json.dumps(result).encode('utf-8'))
+
     # Display answer
-    answer_panel = Panel(
-        result['answer'],
-        title="[bold]Answer[/bold]",
-        border_style="blue"
-    )
-    console.print(answer_panel)
+    answer_panel = Panel(result['answer'], **_ANSWER_PANEL_KWARGS)
+    _console().print(answer_panel)
     
     # Display sources
     if result['sources']:
-        console.print("\n[bold]Sources:[/bold]")
+        # Make paths relative to the project with one prefix strip
+        # per source instead of Path construction and traversal
+        proj_prefix = project_path_str + os.sep
+        _console().print("\n[bold]Sources:[/bold]")
         for source in result['sources']:
-            # Make path relative to project
-            try:
-                rel_path = Path(source).relative_to(project_path)
-                console.print(f"  • {rel_path}")
-            except:
-                console.print(f"  • {source}")
+            _console().print(f"  • {_rel_source(source, proj_prefix)}")
                 
     if result.get('error'):
-        console.print("\n[bold red]Note: There was an error generating the answer. Please check your API key and connection.[/bold red]")
+        _console().print("\n[bold red]Note: There was an error generating the answer. Please check your API key and connection.[/bold red]")
 
 
 @app.command()
 def status():
     """Show the status of the Sage knowledge base."""
     project_path = Path.cwd()
-    config_manager = ConfigManager(project_path)
-    
+    project_path_str = str(project_path)
+
     # Load configuration
-    config = config_manager.load()
+    config = _load_config(project_path_str)
     if not config:
-        console.print("[bold red]Project not initialized. Run 'sage setup' first.[/bold red]")
+        _console().print("[bold red]Project not initialized. Run 'sage setup' first.[/bold red]")
         raise typer.Exit(1)
         
+    from rich.table import Table
+
+    from sage.file_processor import load_metadata
+    from sage.vector_store import VectorStore, get_vector_store
+
     # Get vector store info
-    vector_store = VectorStore(config)
-    vector_store.initialize()
+    vector_store = get_vector_store(config)
     doc_count = vector_store.get_document_count()
-    
-    # Get file metadata
-    processor = FileProcessor()
-    metadata = processor.load_metadata(project_path)
+
+    # Get file metadata without building a full FileProcessor
+    metadata = load_metadata(project_path)
     
     # Create status table
     table = Table(title="Project Sage Status", show_header=False)
     table.add_column("Property", style="cyan")
     table.add_column("Value", style="white")
     
-    table.add_row("Project Path", str(project_path))
+    table.add_row("Project Path", project_path_str)
     table.add_row("LLM Provider", config.llm_provider.title())
     table.add_row("LLM Model", config.llm_model)
     table.add_row("Document Language", config.document_language.upper())
     table.add_row("Files Indexed", str(len(metadata)))
     table.add_row("Total Chunks", str(doc_count))
     
-    # Find last update time
+    # Find last update time; ISO-8601 strings sort chronologically,
+    # so take the max as strings and only parse the winner
     if metadata:
-        last_update = max(
-            datetime.fromisoformat(m['processed_at']) 
-            for m in metadata.values()
-        )
-        table.add_row("Last Update", last_update.strftime("%Y-%m-%d %H:%M:%S"))
+        last_str = max(m['processed_at'] for m in metadata.values())
+        last_update = datetime.fromisoformat(last_str)
+        table.add_row("Last Update", last_update.strftime(_TS_DISPLAY_FMT))
     else:
         table.add_row("Last Update", "Never")
         
-    console.print(table)
+    _console().print(table)
     
     if doc_count == 0:
-        console.print("\n[yellow]Knowledge base is empty. Run 'sage update' to index your documents.[/yellow]")
+        _console().print("\n[yellow]Knowledge base is empty. Run 'sage update' to index your documents.[/yellow]")
+
+
+def _run_gui(project_path: Path):
+    """Launch the GUI; the only code path that imports matplotlib/tkinter."""
+    from sage.gui_app import SageGUI
+
+    gui_app = SageGUI(project_path)
+    gui_app.run()
 
 
 @app.command()
@@ -250,19 +520,17 @@ def gui():
     """Launch the enhanced GUI application."""
     project_path = Path.cwd()
     config_manager = ConfigManager(project_path)
-    
-    console.print("[bold blue]Launching Sage GUI...[/bold blue]")
-    
+
+    _console().print("[bold blue]Launching Sage GUI...[/bold blue]")
+
     try:
-        from sage.gui_app import SageGUI
-        app = SageGUI(project_path)
-        app.run()
+        _run_gui(project_path)
     except ImportError as e:
-        console.print(f"[bold red]Error: Missing GUI dependencies: {str(e)}[/bold red]")
-        console.print("Install GUI dependencies with: pip install matplotlib")
+        _console().print(f"[bold red]Error: Missing GUI dependencies: {str(e)}[/bold red]")
+        _console().print("Install GUI dependencies with: pip install matplotlib")
         raise typer.Exit(1)
     except Exception as e:
-        console.print(f"[bold red]Error launching GUI: {str(e)}[/bold red]")
+        _console().print(f"[bold red]Error launching GUI: {str(e)}[/bold red]")
         raise typer.Exit(1)
 
 
@@ -270,30 +538,38 @@ def gui():
 def chat():
     """Start an interactive chat session with your project documents."""
     project_path = Path.cwd()
-    config_manager = ConfigManager(project_path)
-    
+    project_path_str = str(project_path)
+
     # Load configuration
-    config = config_manager.load()
+    config = _load_config(project_path_str)
     if not config:
-        console.print("[bold red]Project not initialized. Run 'sage setup' first.[/bold red]")
+        _console().print("[bold red]Project not initialized. Run 'sage setup' first.[/bold red]")
         raise typer.Exit(1)
-        
+
+    from rich.panel import Panel
+
+    from sage.model_manager import ModelManager
+    from sage.vector_store import VectorStore, get_vector_store
+
     # Initialize components
-    vector_store = VectorStore(config)
-    vector_store.initialize()
-    
+    vector_store = get_vector_store(config)
+
     # Check if knowledge base exists
     doc_count = vector_store.get_document_count()
     if doc_count == 0:
-        console.print("[bold yellow]Knowledge base is empty. Run 'sage update' first.[/bold yellow]")
+        _console().print("[bold yellow]Knowledge base is empty. Run 'sage update' first.[/bold yellow]")
         raise typer.Exit(1)
-        
+
     # Initialize model manager for dynamic switching
     model_manager = ModelManager(config)
-    
+
+    from sage import cache as qa_cache
+
+    query_cache = qa_cache.QueryCache(project_path)
+
     # Start chat session
     current_provider, current_model = model_manager.get_current_model_info()
-    console.print(Panel.fit(
+    _console().print(Panel.fit(
         f"[bold blue]🤖 Sage Interactive Chat[/bold blue]\n\n"
         f"Project: {project_path.name}\n"
         f"Documents: {doc_count} chunks indexed\n"
@@ -305,13 +581,56 @@ def chat():
         border_style="blue"
     ))
     
-    conversation_history = []
-    
+    # Prefer prompt_toolkit for line editing and persistent history
+    # (Ctrl-R recall of past questions); fall back to typer.prompt
+    try:
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.history import FileHistory
+
+        history_path = project_path / ".sage" / "chat_history"
+        history_path.parent.mkdir(parents=True, exist_ok=True)
+        session = PromptSession(history=FileHistory(str(history_path)))
+
+        def _read_question() -> str:
+            return session.prompt("\n🧑 You ")
+    except ImportError:
+        def _read_question() -> str:
+            return typer.prompt("\n🧑 You", prompt_suffix="")
+
+    # Bounded so marathon sessions can't grow memory without limit;
+    # the JSONL session log below keeps the full record on disk
+    conversation_history = deque(maxlen=200)
+    # Running set of (source, relative name) pairs so /sources never
+    # has to re-aggregate or re-relativize the whole history
+    seen_sources = set()
+    proj_prefix = project_path_str + os.sep
+
+    # Each turn is appended to a JSONL session log as it happens, so a
+    # crash loses nothing and session end never re-serializes (or
+    # prompts about saving) the whole conversation
+    chat_dir = project_path / ".sage" / "chats"
+    chat_dir.mkdir(parents=True, exist_ok=True)
+    log_path = chat_dir / f"chat_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+    chat_log = open(log_path, 'ab')
+    logged_turns = 0
+
+    # One Status spinner reused across turns instead of a fresh Live
+    # renderable (and its thread) per question; skipped off-TTY where
+    # a spinner is just noise in captured output
+    from rich.status import Status
+
+    thinking = Status("", console=_console()) if sys.stdout.isatty() else None
+
+    # Re-asking the same question — the usual move when comparing
+    # models after /switch — reuses the live Document objects from the
+    # previous turn without even a cache decode
+    last_question, last_documents = None, None
+
     try:
         while True:
             # Get user input
             try:
-                question = typer.prompt("\n🧑 You", prompt_suffix="")
+                question = _read_question()
             except (KeyboardInterrupt, EOFError):
                 break
                 
@@ -319,146 +638,172 @@ def chat():
             if question.lower().strip() in ['exit', 'quit', 'bye']:
                 break
             elif question.strip().startswith('/'):
-                _handle_chat_command(question.strip(), conversation_history, vector_store, config, model_manager)
+                _handle_chat_command(question.strip(), conversation_history, vector_store, config, model_manager, query_cache, seen_sources)
                 continue
             elif not question.strip():
                 continue
                 
             # Process the question
             current_provider, current_model = model_manager.get_current_model_info()
-            with console.status(f"[bold blue]🤖 {current_provider.title()} {current_model} is thinking...[/bold blue]"):
+            if thinking is not None:
+                thinking.update(f"[bold blue]🤖 {current_provider.title()} {current_model} is thinking...[/bold blue]")
+                spinner_ctx = thinking
+            else:
+                spinner_ctx = nullcontext()
+            with spinner_ctx:
                 try:
                     # Search for relevant documents (adaptive k based on query complexity)
                     k_value = 10 if any(word in question.lower() for word in ['all', 'compare', 'across', 'multiple', 'summary', 'tổng hợp', 'tất cả']) else 5
-                    documents = vector_store.search(question, k=k_value)
-                    
+
+                    if question == last_question:
+                        documents = last_documents
+                    else:
+                        doc_key = qa_cache.query_key(question, k_value)
+                        cached_docs = query_cache.get(doc_key)
+                        if cached_docs is not None:
+                            documents = qa_cache.decode_documents(cached_docs)
+                        else:
+                            documents = vector_store.search(question, k=k_value)
+                            query_cache.put(doc_key, qa_cache.encode_documents(documents))
+                        last_question, last_documents = question, documents
+
                     if not documents:
-                        console.print("[yellow]No relevant documents found for your question.[/yellow]")
+                        _console().print("[yellow]No relevant documents found for your question.[/yellow]")
                         continue
-                        
-                    # Get LLM client for current model
-                    llm_client = model_manager.get_llm_client()
-                    
-                    # Get answer from LLM
-                    result = llm_client.answer_question(question, documents)
-                    
+
+                    # Get answer from LLM, reusing cached answers for
+                    # the same question, model, and chunks
+                    ans_key = qa_cache.answer_key(
+                        question, f"{current_provider}:{current_model}", documents
+                    )
+                    cached_answer = query_cache.get(ans_key)
+                    if cached_answer is not None:
+                        result = json.loads(cached_answer)
+                    else:
+                        llm_client = model_manager.get_llm_client()
+                        result = llm_client.answer_question(question, documents)
+                        if not result.get('error'):
+                            query_cache.put(ans_key, json.dumps(result).encode('utf-8'))
+
                     if result.get('error'):
-                        console.print(f"[bold red]Error: {result['answer']}[/bold red]")
+                        _console().print(f"[bold red]Error: {result['answer']}[/bold red]")
                         continue
                         
                     # Display answer
-                    answer_panel = Panel(
-                        result['answer'],
-                        title="[bold]🤖 Sage[/bold]",
-                        border_style="green"
-                    )
-                    console.print(answer_panel)
+                    answer_panel = Panel(result['answer'], **_SAGE_PANEL_KWARGS)
+                    _console().print(answer_panel)
                     
-                    # Display sources (compact format)
+                    # Display sources (compact format, basenames only)
                     if result['sources']:
                         sources_text = "📚 " + ", ".join([
-                            Path(source).relative_to(project_path).name 
+                            source.rsplit(os.sep, 1)[-1]
                             for source in result['sources']
                         ])
-                        console.print(f"[dim]{sources_text}[/dim]")
+                        _console().print(f"[dim]{sources_text}[/dim]")
                         
-                    # Add to conversation history
-                    conversation_history.append({
+                    seen_sources.update(
+                        (source, _rel_source(source, proj_prefix))
+                        for source in result['sources']
+                    )
+
+                    # Add to conversation history and the session log
+                    entry = {
                         'question': question,
                         'answer': result['answer'],
                         'sources': result['sources'],
-                        'timestamp': datetime.now().isoformat()
-                    })
-                    
+                        # time.strftime skips the datetime object
+                        # allocation; second precision is plenty for
+                        # per-turn log entries
+                        'timestamp': time.strftime(_TS_ISO_FMT)
+                    }
+                    conversation_history.append(entry)
+                    chat_log.write(_dumps_json_line(entry) + b"\n")
+                    chat_log.flush()
+                    logged_turns += 1
+
+
                 except Exception as e:
-                    console.print(f"[bold red]Error: {str(e)}[/bold red]")
-                    console.print("[dim]Check your API key and internet connection[/dim]")
+                    _console().print(f"[bold red]Error: {str(e)}[/bold red]")
+                    _console().print("[dim]Check your API key and internet connection[/dim]")
                     
     except KeyboardInterrupt:
         pass
         
-    # End chat session
-    console.print(f"\n[bold blue]Chat session ended. Asked {len(conversation_history)} questions.[/bold blue]")
-    if conversation_history:
-        save_chat = typer.confirm("Save conversation history?")
-        if save_chat:
-            _save_chat_history(project_path, conversation_history)
+    # End chat session. The in-memory history is clearable (/clear), so
+    # whether the log survives depends on what was actually written
+    chat_log.close()
+    _console().print(f"\n[bold blue]Chat session ended. Asked {logged_turns} questions.[/bold blue]")
+    if logged_turns:
+        _console().print(f"[green]Conversation saved to: {log_path}[/green]")
+    else:
+        log_path.unlink()
 
 
-def _handle_chat_command(command: str, history: list, vector_store: VectorStore, config: SageConfig, model_manager: ModelManager = None):
+def _handle_chat_command(command: str, history: deque, vector_store: VectorStore, config: SageConfig, model_manager: ModelManager = None, query_cache=None, seen_sources=None):
     """Handle special chat commands."""
+    from rich.panel import Panel
+
     cmd = command.lower().strip()
     
     if cmd == '/help':
-        help_text = """[bold]Available Commands:[/bold]
-        
-🔹 /help     - Show this help message
-🔹 /status   - Show knowledge base status  
-🔹 /model    - Show current model and available options
-🔹 /switch   - Switch to a different LLM model
-🔹 /clear    - Clear conversation history
-🔹 /history  - Show conversation history
-🔹 /sources  - List all indexed documents
-🔹 exit      - End chat session
-
-[bold]Model Switching:[/bold]
-• /model - See current model and recommendations
-• /switch google gemini-2.0-flash - Switch to specific model
-• /switch ollama llama3.1:8b - Switch to local Ollama model
-• You can switch models mid-conversation!
+        _console().print(_help_panel())
 
-[bold]Tips:[/bold]
-• Ask specific questions about your project documents
-• Switch models for different tasks (fast vs. quality)
-• Use follow-up questions to dive deeper into topics"""
-        
-        console.print(Panel(help_text, title="Chat Help", border_style="yellow"))
-        
     elif cmd == '/status':
         doc_count = vector_store.get_document_count()
-        status_text = f"""[bold]Knowledge Base Status:[/bold]
+        status_text = _STATUS_TEMPLATE.format(
+            doc_count=doc_count,
+            provider=config.llm_provider.title(),
+            model=config.llm_model,
+            language=config.document_language.upper(),
+            question_count=len(history)
+        )
 
-📊 Documents: {doc_count} chunks indexed
-🤖 LLM: {config.llm_provider.title()} {config.llm_model}  
-📝 Language: {config.document_language.upper()}
-💬 Questions Asked: {len(history)}"""
-        
-        console.print(Panel(status_text, title="Status", border_style="cyan"))
+        _console().print(Panel(status_text, title="Status", border_style="cyan"))
         
     elif cmd == '/clear':
         history.clear()
-        console.print("[yellow]Conversation history cleared.[/yellow]")
+        _console().print("[yellow]Conversation history cleared.[/yellow]")
+
+    elif cmd == '/clear-cache':
+        if query_cache:
+            query_cache.clear()
+            _console().print("[yellow]Query/answer cache cleared.[/yellow]")
+        else:
+            _console().print("[red]Query cache not available[/red]")
         
     elif cmd == '/history':
         if not history:
-            console.print("[yellow]No conversation history yet.[/yellow]")
+            _console().print("[yellow]No conversation history yet.[/yellow]")
             return
             
-        console.print(f"[bold]Conversation History ({len(history)} questions):[/bold]\n")
-        for i, item in enumerate(history[-5:], 1):  # Show last 5
-            console.print(f"[cyan]{i}. Q:[/cyan] {item['question'][:100]}...")
-            console.print(f"[green]   A:[/green] {item['answer'][:150]}...\n")
+        lines = [f"[bold]Conversation History ({len(history)} questions):[/bold]\n"]
+        # islice instead of history[-5:]: works on the deque and
+        # avoids copying the tail
+        last_five = islice(history, max(0, len(history) - 5), None)
+        for i, item in enumerate(last_five, 1):  # Show last 5
+            lines.append(f"[cyan]{i}. Q:[/cyan] {item['question'][:100]}...")
+            lines.append(f"[green]   A:[/green] {item['answer'][:150]}...\n")
+        _console().print("\n".join(lines))
             
     elif cmd == '/sources':
-        # Get unique sources from conversation
-        all_sources = set()
-        for item in history:
-            all_sources.update(item.get('sources', []))
-            
-        if all_sources:
-            console.print("[bold]Documents referenced in conversation:[/bold]")
-            for source in sorted(all_sources):
-                try:
-                    rel_path = Path(source).relative_to(Path.cwd())
-                    console.print(f"📄 {rel_path}")
-                except:
-                    console.print(f"📄 {source}")
+        # The chat loop maintains the unique (source, relative name)
+        # pairs incrementally; fall back to aggregating from history
+        if seen_sources is None:
+            seen_sources = {
+                (src, src)
+                for item in history for src in item.get('sources', [])
+            }
+
+        if seen_sources:
+            _console().print("[bold]Documents referenced in conversation:[/bold]")
+            for _, rel_name in sorted(seen_sources, key=lambda pair: pair[1]):
+                _console().print(f"📄 {rel_name}")
         else:
-            console.print("[yellow]No sources referenced yet.[/yellow]")
+            _console().print("[yellow]No sources referenced yet.[/yellow]")
             
     elif cmd == '/model':
         if not model_manager:
-            console.print("[red]Model manager not available[/red]")
+            _console().print("[red]Model manager not available[/red]")
             return
             
         current_provider, current_model = model_manager.get_current_model_info()
@@ -484,18 +829,18 @@ def _handle_chat_command(command: str, history: list, vector_store: VectorStore,
 • /switch google gemini-2.0-flash - Switch to fast model
 • /switch ollama llama3.1:8b - Switch to local model"""
         
-        console.print(Panel(model_text, title="Model Information", border_style="blue"))
+        _console().print(Panel(model_text, title="Model Information", border_style="blue"))
         
     elif cmd.startswith('/switch'):
         if not model_manager:
-            console.print("[red]Model manager not available[/red]")
+            _console().print("[red]Model manager not available[/red]")
             return
             
         # Parse switch command: /switch provider model
         parts = command.split()
         if len(parts) != 3:
-            console.print("[red]Usage: /switch <provider> <model>[/red]")
-            console.print("[dim]Example: /switch google gemini-2.0-flash[/dim]")
+            _console().print("[red]Usage: /switch <provider> <model>[/red]")
+            _console().print("[dim]Example: /switch google gemini-2.0-flash[/dim]")
             return
             
         _, provider, model = parts
@@ -503,59 +848,40 @@ def _handle_chat_command(command: str, history: list, vector_store: VectorStore,
         # Attempt to switch
         if model_manager.switch_model(provider, model):
             description = model_manager.get_model_description(provider, model)
-            console.print(f"[green]✓ Switched to {provider.title()} {model}[/green]")
-            console.print(f"[dim]{description}[/dim]")
+            _console().print(f"[green]✓ Switched to {provider.title()} {model}[/green]")
+            _console().print(f"[dim]{description}[/dim]")
         else:
-            console.print(f"[red]Failed to switch to {provider} {model}[/red]")
-            console.print("[dim]Check provider name, model name, and API key configuration[/dim]")
+            _console().print(f"[red]Failed to switch to {provider} {model}[/red]")
+            _console().print("[dim]Check provider name, model name, and API key configuration[/dim]")
             
     else:
-        console.print(f"[red]Unknown command: {command}[/red]")
-        console.print("[dim]Type '/help' for available commands[/dim]")
-
-
-def _save_chat_history(project_path: Path, history: list):
-    """Save conversation history to file."""
-    try:
-        chat_dir = project_path / ".sage" / "chats"
-        chat_dir.mkdir(exist_ok=True)
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"chat_{timestamp}.json"
-        
-        chat_file = chat_dir / filename
-        with open(chat_file, 'w') as f:
-            json.dump({
-                'project_path': str(project_path),
-                'timestamp': datetime.now().isoformat(),
-                'question_count': len(history),
-                'conversation': history
-            }, f, indent=2)
-            
-        console.print(f"[green]Conversation saved to: {chat_file}[/green]")
-        
-    except Exception as e:
-        console.print(f"[red]Failed to save conversation: {e}[/red]")
+        _console().print(f"[red]Unknown command: {command}[/red]")
+        _console().print("[dim]Type '/help' for available commands[/dim]")
 
 
 @app.command()
 def models():
     """Show available models and switch default model."""
     project_path = Path.cwd()
-    config_manager = ConfigManager(project_path)
-    
+    project_path_str = str(project_path)
+
     # Load configuration
-    config = config_manager.load()
+    config = _load_config(project_path_str)
     if not config:
-        console.print("[bold red]Project not initialized. Run 'sage setup' first.[/bold red]")
+        _console().print("[bold red]Project not initialized. Run 'sage setup' first.[/bold red]")
         raise typer.Exit(1)
         
+    from rich.panel import Panel
+    from rich.table import Table
+
+    from sage.model_manager import ModelManager
+
     # Initialize model manager
     model_manager = ModelManager(config)
     
     # Show current model
     current_provider, current_model = model_manager.get_current_model_info()
-    console.print(Panel(
+    _console().print(Panel(
         f"[bold]Current Default Model:[/bold]\n"
         f"🤖 {current_provider.title()} {current_model}\n"
         f"{model_manager.get_model_description(current_provider, current_model)}",
@@ -565,12 +891,12 @@ def models():
     
     # Show configured providers
     configured = model_manager.get_configured_providers()
-    console.print(f"\n[bold]Configured Providers:[/bold] {', '.join([p.title() for p in configured])}")
+    _console().print(f"\n[bold]Configured Providers:[/bold] {', '.join([p.title() for p in configured])}")
     
     # Show recommendations
     recommendations = model_manager.get_recommended_models()
     if recommendations:
-        console.print("\n[bold]Recommended Models by Use Case:[/bold]")
+        _console().print("\n[bold]Recommended Models by Use Case:[/bold]")
         table = Table(show_header=True, header_style="bold magenta")
         table.add_column("Use Case", style="cyan")
         table.add_column("Provider", style="green") 
@@ -590,10 +916,10 @@ def models():
                 description
             )
             
-        console.print(table)
+        _console().print(table)
         
         # Show embedding information
-        console.print(f"\n[bold]📊 Embedding Models by Provider:[/bold]")
+        _console().print(f"\n[bold]📊 Embedding Models by Provider:[/bold]")
         provider_comparison = model_manager.get_provider_comparison()
         
         embed_table = Table(show_header=True, header_style="bold blue")
@@ -610,10 +936,10 @@ def models():
                 info["privacy"]
             )
             
-        console.print(embed_table)
+        _console().print(embed_table)
     
     # Show all available models
-    console.print(f"\n[bold]All Available Models:[/bold]")
+    _console().print(f"\n[bold]All Available Models:[/bold]")
     models_list = model_manager.list_available_models()
     
     # Group by provider
@@ -628,28 +954,28 @@ def models():
         unavailable_models = [m for m, a in model_list if not a]
         
         provider_status = "✅" if available_models else "❌" 
-        console.print(f"\n{provider_status} [bold]{provider.title()}:[/bold]")
+        _console().print(f"\n{provider_status} [bold]{provider.title()}:[/bold]")
         
         if available_models:
             for model in available_models:
-                console.print(f"  ✓ {model}")
+                _console().print(f"  ✓ {model}")
         if unavailable_models:
-            console.print(f"  [dim]Not configured: {', '.join(unavailable_models[:3])}{'...' if len(unavailable_models) > 3 else ''}[/dim]")
+            _console().print(f"  [dim]Not configured: {', '.join(unavailable_models[:3])}{'...' if len(unavailable_models) > 3 else ''}[/dim]")
     
     # Show switching tips
     switching_tips = model_manager.get_switching_tips()
-    console.print(f"\n[bold]💡 Model Switching Tips:[/bold]")
+    _console().print(f"\n[bold]💡 Model Switching Tips:[/bold]")
     for tip in switching_tips:
-        console.print(f"  • {tip}")
+        _console().print(f"  • {tip}")
         
-    console.print(f"\n[dim]Use 'sage chat' and '/switch <provider> <model>' to change models during conversation[/dim]")
+    _console().print(f"\n[dim]Use 'sage chat' and '/switch <provider> <model>' to change models during conversation[/dim]")
 
 
 @app.command()
 def version():
     """Show Sage version."""
     from sage import __version__
-    console.print(f"Project Sage v{__version__}")
+    _console().print(f"Project Sage v{__version__}")
 
 
 def main():
@@ -657,10 +983,10 @@ def main():
     try:
         app()
     except KeyboardInterrupt:
-        console.print("\n[yellow]Operation cancelled by user.[/yellow]")
+        _console().print("\n[yellow]Operation cancelled by user.[/yellow]")
         raise typer.Exit(0)
     except Exception as e:
-        console.print(f"[bold red]Error: {str(e)}[/bold red]")
+        _console().print(f"[bold red]Error: {str(e)}[/bold red]")
         raise typer.Exit(1)
 
 
@@ -1,10 +1,10 @@
 """Configuration management for Project Sage."""
 
-import json
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field, SecretStr
+from pydantic import BaseModel, Field, PrivateAttr, SecretStr, field_serializer
 
 
 class SageConfig(BaseModel):
@@ -43,13 +43,21 @@ class SageConfig(BaseModel):
     # Runtime settings (not saved to config)
     current_chat_provider: Optional[str] = Field(default=None, exclude=True, description="Current chat provider override")
     current_chat_model: Optional[str] = Field(default=None, exclude=True, description="Current chat model override")
-    
-    class Config:
-        json_encoders = {
-            SecretStr: lambda v: v.get_secret_value() if v else None,
-            Path: str
-        }
-    
+
+    # Plaintext keys resolved once per provider; the SecretStr fields
+    # are immutable after construction so this never needs invalidating
+    _api_key_cache: Dict[str, str] = PrivateAttr(default_factory=dict)
+    
+    @field_serializer('api_key', 'google_api_key', 'anthropic_api_key',
+                      'openai_api_key', when_used='json')
+    def _serialize_secret(self, value: Optional[SecretStr]):
+        return value.get_secret_value() if value else None
+
+    @field_serializer('project_path', when_used='json')
+    def _serialize_path(self, value: Path) -> str:
+        return str(value)
+
+
     def get_index_provider_model(self) -> tuple[str, str]:
         """Get the provider and model to use for indexing/embeddings."""
         if self.index_provider and self.index_model:
@@ -80,6 +88,15 @@ class SageConfig(BaseModel):
     
     def _get_provider_api_key(self, provider: str) -> str:
         """Get API key for a specific provider."""
+        cached = self._api_key_cache.get(provider)
+        if cached is not None:
+            return cached
+        key = self._resolve_provider_api_key(provider)
+        self._api_key_cache[provider] = key
+        return key
+
+    def _resolve_provider_api_key(self, provider: str) -> str:
+        """Unwrap the SecretStr for a provider (uncached)."""
         if provider == "google":
             if self.google_api_key:
                 return self.google_api_key.get_secret_value()
@@ -100,6 +117,22 @@ class SageConfig(BaseModel):
         return ""
 
 
+@lru_cache(maxsize=8)
+def _load_config_cached(path_str: str, mtime_ns: int) -> SageConfig:
+    """Parse and validate a config file, memoized on (path, mtime).
+
+    Every command loads the config, and chat sessions may reload it;
+    keying on the file's mtime means repeat loads in one process skip
+    the parse entirely, while an edited file changes its mtime and
+    misses naturally. The parse itself goes through pydantic-core's
+    single-pass JSON validator: SecretStr fields accept plain strings
+    and project_path accepts a str natively, so none of the manual
+    per-field wrapping the old loader did is needed.
+    """
+    with open(path_str, 'rb') as f:
+        return SageConfig.model_validate_json(f.read())
+
+
 class ConfigManager:
     """Manages Sage configuration for a project."""
     
@@ -117,61 +150,34 @@ class ConfigManager:
     
     def load(self) -> Optional[SageConfig]:
         """Load configuration from file."""
-        if not self.exists():
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
             return None
-            
-        with open(self.config_path, 'r') as f:
-            data = json.load(f)
-            
-            # Handle SecretStr fields properly
-            data['api_key'] = SecretStr(data.get('api_key', ''))
-            if data.get('google_api_key'):
-                data['google_api_key'] = SecretStr(data['google_api_key'])
-            if data.get('anthropic_api_key'):
-                data['anthropic_api_key'] = SecretStr(data['anthropic_api_key'])
-            if data.get('openai_api_key'):
-                data['openai_api_key'] = SecretStr(data['openai_api_key'])
-                
-            data['project_path'] = Path(data.get('project_path', self.project_path))
-            
-            # Handle new separate configuration fields  
-            data['index_provider'] = data.get('index_provider')
-            data['index_model'] = data.get('index_model')
-            data['chat_provider'] = data.get('chat_provider')
-            data['chat_model'] = data.get('chat_model')
-            return SageConfig(**data)
+        return _load_config_cached(str(self.config_path), stat.st_mtime_ns)
     
     def save(self, config: SageConfig) -> None:
         """Save configuration to file."""
         os.makedirs(self.config_path.parent, exist_ok=True)
         os.makedirs(self.db_path, exist_ok=True)
-        
-        data = config.dict()
-        
-        # Handle SecretStr fields properly
-        data['api_key'] = config.api_key.get_secret_value() if config.api_key else None
-        data['google_api_key'] = config.google_api_key.get_secret_value() if config.google_api_key else None
-        data['anthropic_api_key'] = config.anthropic_api_key.get_secret_value() if config.anthropic_api_key else None
-        data['openai_api_key'] = config.openai_api_key.get_secret_value() if config.openai_api_key else None
-        data['project_path'] = str(config.project_path)
-        
-        # Handle new separate configuration fields
-        data['index_provider'] = config.index_provider
-        data['index_model'] = config.index_model
-        data['chat_provider'] = config.chat_provider
-        data['chat_model'] = config.chat_model
-        
-        with open(self.config_path, 'w') as f:
-            json.dump(data, f, indent=2)
+
+        # The field serializers handle SecretStr unwrapping and the
+        # Path conversion, and the runtime-only chat overrides are
+        # already marked exclude=True, so one Rust-side dump replaces
+        # the old dict copy + manual field rewriting. Written to a
+        # sibling temp file and renamed so a crash mid-save can never
+        # leave a torn config behind.
+        tmp_path = self.config_path.with_suffix('.json.tmp')
+        tmp_path.write_bytes(config.model_dump_json(indent=2).encode('utf-8'))
+        os.replace(tmp_path, self.config_path)
             
-        # Add to .gitignore if it exists
+        # Add to .gitignore if it exists; a bytes scan skips the UTF-8
+        # decode since the pattern we look for is plain ASCII
         gitignore_path = self.project_path / ".gitignore"
         if gitignore_path.exists():
-            with open(gitignore_path, 'r') as f:
-                content = f.read()
-            if ".sage/" not in content:
-                with open(gitignore_path, 'a') as f:
-                    f.write("\n# Sage configuration\n.sage/\n")
+            if b'.sage/' not in gitignore_path.read_bytes():
+                with open(gitignore_path, 'ab') as f:
+                    f.write(b"\n# Sage configuration\n.sage/\n")
     
     def get_db_path(self) -> Path:
         """Get the path to the vector database."""
@@ -3,23 +3,99 @@
 import os
 import hashlib
 import json
+import mmap
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Iterator, List, Dict, Any, Optional
 from datetime import datetime
 
-from unstructured.partition.auto import partition
-from unstructured.partition.pdf import partition_pdf
-from unstructured.partition.docx import partition_docx
-from unstructured.partition.pptx import partition_pptx
-from unstructured.partition.xlsx import partition_xlsx
-from unstructured.partition.text import partition_text
-from unstructured.partition.md import partition_md
-import pytesseract
-from PIL import Image
-
+# The unstructured partitioners (and their native deps: poppler,
+# python-docx, openpyxl, tesseract via pytesseract) are imported inside
+# the branch that needs them, so commands that never parse a document
+# skip the whole load chain
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 
+# blake3 hashes with SIMD and internal tree parallelism, several times
+# faster than hashlib on multi-MB documents; fall back to the stdlib
+try:
+    import blake3
+    HAS_BLAKE3 = True
+except ImportError:
+    HAS_BLAKE3 = False
+
+# The metadata file grows with the corpus and is parsed on every scan;
+# orjson handles it several times faster than the stdlib
+try:
+    import orjson
+
+    def _loads_json(data: bytes):
+        return orjson.loads(data)
+
+    def _dumps_json(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _loads_json(data: bytes):
+        return json.loads(data)
+
+    def _dumps_json(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode("utf-8")
+
+
+METADATA_FILE = ".sage/file_metadata.json"
+
+
+@lru_cache(maxsize=8)
+def _get_text_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    """Build (once per settings) the shared recursive text splitter.
+
+    The splitter compiles its separator handling at construction, so
+    processors created per command, per worker, or per GUI action all
+    reuse one instance instead of paying that setup repeatedly.
+    """
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+        # Better separators for Vietnamese and structured documents
+        separators=["\n\n", "\n", ". ", "。", "! ", "? ", " ", ""]
+    )
+
+
+def load_metadata(project_path: Path) -> Dict[str, Dict]:
+    """Load file metadata from cache.
+
+    Module-level so callers that only need the metadata (e.g. status
+    displays) don't have to construct a FileProcessor.
+    """
+    metadata_path = project_path / METADATA_FILE
+    if metadata_path.exists():
+        return _loads_json(metadata_path.read_bytes())
+    return {}
+
+
+# Per-process FileProcessor reused across pool jobs so the text
+# splitter is built once per worker process, not once per file
+_WORKER: Optional["FileProcessor"] = None
+
+
+def process_file_job(file_path: Path, project_path: Path, chunk_size: int,
+                     chunk_overlap: int, ocr_language: str,
+                     now: Optional[str] = None) -> List[Document]:
+    """Process one file inside a ProcessPoolExecutor worker.
+
+    Module-level so it is picklable; receives plain settings instead of
+    a FileProcessor because the splitter itself doesn't pickle cheaply.
+    """
+    global _WORKER
+    settings = (chunk_size, chunk_overlap, ocr_language)
+    if _WORKER is None or (_WORKER.chunk_size, _WORKER.chunk_overlap,
+                           _WORKER.ocr_language) != settings:
+        _WORKER = FileProcessor(chunk_size, chunk_overlap, ocr_language)
+    return _WORKER.process_file(file_path, project_path, now=now)
+
 
 class FileProcessor:
     """Processes various file types for indexing."""
@@ -27,139 +103,243 @@ class FileProcessor:
     SUPPORTED_EXTENSIONS = {
         '.pdf', '.docx', '.pptx', '.xlsx', '.txt', '.md'
     }
-    
+
+    # Directories whose entire subtrees are skipped while scanning
+    DEFAULT_EXCLUDE_DIRS = {
+        '.git', '.sage', '.venv', 'venv', 'node_modules', '__pycache__'
+    }
+
+    # Human-readable names for the top-level project phase folders
+    PHASE_DESCRIPTIONS = {
+        "01.Origination&Dev": "Project Development and Origination Phase",
+        "02.Execution": "Project Construction and Execution Phase",
+        "03.Operation": "Project Operation and Maintenance Phase"
+    }
+
+
     def __init__(self, chunk_size: int = 1500, chunk_overlap: int = 300, ocr_language: str = "eng"):
         # Enhanced chunk size for better context preservation
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.ocr_language = ocr_language
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            length_function=len,
-            # Better separators for Vietnamese and structured documents
-            separators=["\n\n", "\n", ". ", "。", "! ", "? ", " ", ""]
-        )
-        self.metadata_file = ".sage/file_metadata.json"
+        self.text_splitter = _get_text_splitter(chunk_size, chunk_overlap)
+        self.metadata_file = METADATA_FILE
+        # Folder context is identical for every sibling file, so it is
+        # computed once per directory, not once per file
+        self._folder_ctx_cache: Dict[tuple, Dict[str, str]] = {}
     
     def _extract_folder_context(self, file_path: Path, project_path: Path) -> Dict[str, str]:
         """Extract hierarchical context from folder structure."""
         try:
             # Get relative path from project root
             rel_path = file_path.relative_to(project_path)
-            path_parts = list(rel_path.parts[:-1])  # Exclude filename
-            
-            # Create hierarchical context
-            context = {
-                "project_category": "",
-                "main_phase": "",
-                "sub_category": "",
-                "specific_area": "",
-                "folder_hierarchy": " > ".join(path_parts) if path_parts else "root"
-            }
-            
-            if len(path_parts) >= 1:
-                # Main project phase (01.Origination&Dev, 02.Execution, 03.Operation)
-                context["main_phase"] = path_parts[0]
-                
-            if len(path_parts) >= 2:
-                # Project category (Project_Management, ACES, Studies_Design, etc.)
-                context["project_category"] = path_parts[1]
-                
-            if len(path_parts) >= 3:
-                # Sub category (Meetings, Budget_DevEx, etc.)
-                context["sub_category"] = path_parts[2]
-                
-            if len(path_parts) >= 4:
-                # Specific area (detailed breakdown)
-                context["specific_area"] = path_parts[3]
-            
-            # Create descriptive context for embeddings
-            if context["main_phase"]:
-                phase_desc = {
-                    "01.Origination&Dev": "Project Development and Origination Phase",
-                    "02.Execution": "Project Construction and Execution Phase", 
-                    "03.Operation": "Project Operation and Maintenance Phase"
-                }.get(context["main_phase"], context["main_phase"])
-                context["phase_description"] = phase_desc
-            
-            return context
-            
+            parent_parts = rel_path.parts[:-1]  # Exclude filename
         except Exception:
             return {
                 "project_category": "unknown",
-                "main_phase": "unknown", 
+                "main_phase": "unknown",
                 "sub_category": "unknown",
                 "specific_area": "unknown",
                 "folder_hierarchy": "unknown",
                 "phase_description": "Unknown project phase"
             }
+
+        cached = self._folder_ctx_cache.get(parent_parts)
+        if cached is not None:
+            return cached
+
+        path_parts = list(parent_parts)
+
+        # Create hierarchical context
+        context = {
+            "project_category": "",
+            "main_phase": "",
+            "sub_category": "",
+            "specific_area": "",
+            "folder_hierarchy": " > ".join(path_parts) if path_parts else "root"
+        }
+
+        if len(path_parts) >= 1:
+            # Main project phase (01.Origination&Dev, 02.Execution, 03.Operation)
+            context["main_phase"] = path_parts[0]
+
+        if len(path_parts) >= 2:
+            # Project category (Project_Management, ACES, Studies_Design, etc.)
+            context["project_category"] = path_parts[1]
+
+        if len(path_parts) >= 3:
+            # Sub category (Meetings, Budget_DevEx, etc.)
+            context["sub_category"] = path_parts[2]
+
+        if len(path_parts) >= 4:
+            # Specific area (detailed breakdown)
+            context["specific_area"] = path_parts[3]
+
+        # Create descriptive context for embeddings
+        if context["main_phase"]:
+            context["phase_description"] = self.PHASE_DESCRIPTIONS.get(
+                context["main_phase"], context["main_phase"]
+            )
+
+        # Intern the values so every chunk metadata built from this
+        # context shares one string object per distinct phase/category
+        # rather than carrying its own copy through the pipeline
+        context = {k: sys.intern(v) for k, v in context.items()}
+        self._folder_ctx_cache[parent_parts] = context
+        return context
         
     def load_metadata(self, project_path: Path) -> Dict[str, Dict]:
         """Load file metadata from cache."""
-        metadata_path = project_path / self.metadata_file
-        if metadata_path.exists():
-            with open(metadata_path, 'r') as f:
-                return json.load(f)
-        return {}
+        return load_metadata(project_path)
         
     def save_metadata(self, project_path: Path, metadata: Dict[str, Dict]):
         """Save file metadata to cache."""
         metadata_path = project_path / self.metadata_file
         os.makedirs(metadata_path.parent, exist_ok=True)
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        metadata_path.write_bytes(_dumps_json(metadata))
             
     def get_file_hash(self, file_path: Path) -> str:
-        """Calculate hash of a file."""
-        hasher = hashlib.md5()
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hasher.update(chunk)
+        """Calculate a change-detection fingerprint of a file.
+
+        Not used cryptographically, so blake3 over a memory-mapped
+        view is preferred when available: the kernel feeds pages
+        straight to the SIMD hasher with no Python read loop.
+        """
+        with open(file_path, 'rb', buffering=0) as f:
+            if HAS_BLAKE3:
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        return blake3.blake3(
+                            mm, max_threads=blake3.blake3.AUTO
+                        ).hexdigest()
+                except ValueError:
+                    # Empty files can't be mapped
+                    return blake3.blake3(b"").hexdigest()
+
+            # One reusable 1 MiB buffer: readinto fills it in place, so
+            # hashing does no per-chunk allocation and far fewer reads
+            # than the old 4 KiB loop
+            hasher = hashlib.md5()
+            buf = bytearray(1 << 20)
+            view = memoryview(buf)
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                hasher.update(view[:n])
         return hasher.hexdigest()
         
-    def find_files(self, project_path: Path, force: bool = False) -> List[Path]:
-        """Find all supported files in the project directory."""
-        files_to_process = []
+    def _scan_entries(self, project_path: Path, exclude: set) -> Iterator[os.DirEntry]:
+        """Yield DirEntry objects for supported files under project_path.
+
+        Explicit scandir recursion keeps each entry's cached stat result
+        available to callers, where os.walk would throw it away and
+        force a fresh syscall per file.
+        """
+        stack = [str(project_path)]
+        while stack:
+            try:
+                scan = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with scan:
+                for entry in scan:
+                    if entry.is_dir(follow_symlinks=False):
+                        # Pruned here so excluded subtrees are never
+                        # even scanned
+                        if entry.name not in exclude:
+                            stack.append(entry.path)
+                    elif (entry.is_file(follow_symlinks=False)
+                          and os.path.splitext(entry.name)[1].lower() in self.SUPPORTED_EXTENSIONS):
+                        yield entry
+
+    def iter_files(self, project_path: Path, force: bool = False,
+                   exclude_dirs: Optional[set] = None) -> Iterator[Path]:
+        """Yield supported files that need processing as the scan streams.
+
+        Args:
+            project_path: Root directory to scan
+            force: Re-process files even if unchanged
+            exclude_dirs: Directory names to prune from the walk
+                (defaults to DEFAULT_EXCLUDE_DIRS)
+        """
         metadata = self.load_metadata(project_path) if not force else {}
-        
-        for ext in self.SUPPORTED_EXTENSIONS:
-            for file_path in project_path.rglob(f"*{ext}"):
-                # Skip files in .sage directory
-                if ".sage" in str(file_path):
+        exclude = self.DEFAULT_EXCLUDE_DIRS if exclude_dirs is None else set(exclude_dirs)
+
+        # Files whose mtime changed but might be identical; their hash
+        # comparison is deferred so it can run in parallel after the scan
+        suspects = []
+
+        for entry in self._scan_entries(project_path, exclude):
+            cached = None if force else metadata.get(entry.path)
+
+            if cached is not None:
+                # DirEntry.stat() reuses the result fetched during the
+                # scan; an unchanged (mtime, size) fingerprint skips
+                # reading the file at all
+                stat = entry.stat()
+                if (cached.get('mtime_ns') == stat.st_mtime_ns
+                        and cached.get('size') == stat.st_size):
                     continue
-                    
-                file_str = str(file_path)
-                file_hash = self.get_file_hash(file_path)
-                
-                # Check if file needs processing
-                if force or file_str not in metadata or metadata[file_str].get('hash') != file_hash:
-                    files_to_process.append(file_path)
-                    
-        return files_to_process
+                # Touched but possibly identical content (or metadata
+                # written before mtimes were recorded): needs the hash
+                suspects.append((Path(entry.path), cached.get('hash')))
+                continue
+
+            yield Path(entry.path)
+
+        # Hashing releases the GIL, so threads overlap page-cache reads
+        # with hashing instead of fingerprinting one file at a time
+        if suspects:
+            workers = min(32, (os.cpu_count() or 4) * 2)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                hashes = executor.map(
+                    self.get_file_hash, (path for path, _ in suspects)
+                )
+                for (file_path, cached_hash), file_hash in zip(suspects, hashes):
+                    if cached_hash != file_hash:
+                        yield file_path
+
+    def find_files(self, project_path: Path, force: bool = False,
+                   exclude_dirs: Optional[set] = None) -> List[Path]:
+        """Find all supported files in the project directory."""
+        return list(self.iter_files(project_path, force, exclude_dirs))
         
-    def process_file(self, file_path: Path, project_path: Path = None) -> List[Document]:
-        """Process a single file and return documents with enhanced context."""
+    def process_file(self, file_path: Path, project_path: Path = None,
+                     now: Optional[str] = None) -> List[Document]:
+        """Process a single file and return documents with enhanced context.
+
+        Batch callers pass ``now`` (an ISO timestamp) so one clock read
+        covers the whole batch instead of one per file.
+        """
         ext = file_path.suffix.lower()
         
         try:
-            if ext == '.pdf':
-                elements = self._process_pdf(file_path)
-            elif ext == '.docx':
-                elements = partition_docx(filename=str(file_path))
-            elif ext == '.pptx':
-                elements = partition_pptx(filename=str(file_path))
-            elif ext == '.xlsx':
-                elements = partition_xlsx(filename=str(file_path))
-            elif ext == '.txt':
-                elements = partition_text(filename=str(file_path))
-            elif ext == '.md':
-                elements = partition_md(filename=str(file_path))
+            if ext in ('.txt', '.md'):
+                # Plain text needs none of unstructured's partition
+                # machinery (element objects, language detection) —
+                # the content is the text
+                original_text = file_path.read_text(
+                    encoding='utf-8', errors='replace'
+                )
             else:
-                elements = partition(filename=str(file_path))
-                
-            # Convert elements to text
-            original_text = "\n\n".join([str(el) for el in elements])
+                if ext == '.pdf':
+                    elements = self._process_pdf(file_path)
+                elif ext == '.docx':
+                    from unstructured.partition.docx import partition_docx
+                    elements = partition_docx(filename=str(file_path))
+                elif ext == '.pptx':
+                    from unstructured.partition.pptx import partition_pptx
+                    elements = partition_pptx(filename=str(file_path))
+                elif ext == '.xlsx':
+                    from unstructured.partition.xlsx import partition_xlsx
+                    elements = partition_xlsx(filename=str(file_path))
+                else:
+                    from unstructured.partition.auto import partition
+                    elements = partition(filename=str(file_path))
+
+                # Convert elements to text
+                original_text = "\n\n".join(str(el) for el in elements)
             
             # Extract folder context if project_path provided
             folder_context = {}
@@ -184,54 +364,91 @@ Content:
             metadata = {
                 "source": str(file_path),
                 "file_type": ext,
-                "processed_at": datetime.now().isoformat(),
+                "processed_at": now or datetime.now().isoformat(),
                 **folder_context  # Include all folder context
             }
             
-            # Split enhanced text into chunks
-            documents = self.text_splitter.create_documents(
-                texts=[enhanced_text],
-                metadatas=[metadata]
-            )
-            
-            # Add chunk index and ensure context is preserved
-            for i, doc in enumerate(documents):
-                doc.metadata["chunk_index"] = i
-                doc.metadata["total_chunks"] = len(documents)
-                # Add search-friendly context
-                doc.metadata["search_context"] = (
-                    f"{folder_context.get('phase_description', '')} "
-                    f"{folder_context.get('project_category', '')} "
-                    f"{folder_context.get('folder_hierarchy', '')}"
-                ).strip()
-                
-            return documents
+            # Search-friendly context is the same for every chunk of
+            # this file, so build it once outside the loop
+            search_context = (
+                f"{folder_context.get('phase_description', '')} "
+                f"{folder_context.get('project_category', '')} "
+                f"{folder_context.get('folder_hierarchy', '')}"
+            ).strip()
+
+            # Split into chunks and build the Documents directly:
+            # {**metadata, ...} is one C-level dict copy per chunk,
+            # where create_documents deep-copies the shared metadata
+            # for every chunk it emits
+            chunks = self.text_splitter.split_text(enhanced_text)
+            total_chunks = len(chunks)
+            return [
+                Document(
+                    page_content=chunk,
+                    metadata={
+                        **metadata,
+                        "chunk_index": i,
+                        "total_chunks": total_chunks,
+                        "search_context": search_context,
+                    }
+                )
+                for i, chunk in enumerate(chunks)
+            ]
             
         except Exception as e:
             print(f"Error processing {file_path}: {str(e)}")
             return []
             
+    def _pdf_needs_ocr(self, file_path: Path) -> Optional[bool]:
+        """Cheaply check the leading pages for an embedded text layer.
+
+        Returns True when the PDF looks scanned, False when it has real
+        text, or None when the probe can't tell; costs milliseconds
+        against the seconds a full layout-analysis pass takes.
+        """
+        try:
+            from pdfminer.high_level import extract_text
+            text = extract_text(str(file_path), maxpages=3)
+        except Exception:
+            return None
+        return len(text.strip()) < 100
+
     def _process_pdf(self, file_path: Path) -> List:
         """Process PDF with OCR support for scanned documents."""
+        from unstructured.partition.pdf import partition_pdf
+
+        # Decide the strategy up front so scanned PDFs go straight to
+        # OCR instead of paying a full (useless) extraction pass first
+        needs_ocr = self._pdf_needs_ocr(file_path)
+
         try:
-            # Try regular text extraction first
-            elements = partition_pdf(
-                filename=str(file_path),
-                strategy="auto",
-                languages=[self.ocr_language] if self.ocr_language != "eng" else None
-            )
-            
-            # Check if we got meaningful text
-            text_content = " ".join([str(el) for el in elements])
-            if len(text_content.strip()) < 100:
-                # Likely a scanned document, use OCR
-                elements = partition_pdf(
+            if needs_ocr:
+                return partition_pdf(
                     filename=str(file_path),
                     strategy="ocr_only",
                     languages=[self.ocr_language],
                     ocr_languages=self.ocr_language
                 )
-                
+
+            elements = partition_pdf(
+                filename=str(file_path),
+                strategy="auto",
+                languages=[self.ocr_language] if self.ocr_language != "eng" else None
+            )
+
+            if needs_ocr is None:
+                # Probe couldn't tell; keep the old post-hoc check but
+                # measure the first elements instead of materializing
+                # the entire concatenated text just to take its length
+                if sum(len(str(el).strip()) for el in elements[:20]) < 100:
+                    # Likely a scanned document, use OCR
+                    elements = partition_pdf(
+                        filename=str(file_path),
+                        strategy="ocr_only",
+                        languages=[self.ocr_language],
+                        ocr_languages=self.ocr_language
+                    )
+
             return elements
             
         except Exception as e:
@@ -253,11 +470,47 @@ Content:
         """Update metadata for processed file."""
         metadata = self.load_metadata(project_path)
         
+        stat = file_path.stat()
         metadata[str(file_path)] = {
             "hash": self.get_file_hash(file_path),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
             "processed_at": datetime.now().isoformat(),
             "chunk_count": len(documents),
             "language": self.ocr_language
         }
-        
+
+        self.save_metadata(project_path, metadata)
+
+    def update_metadata_batch(self, project_path: Path, processed: List[tuple]):
+        """Update metadata for many processed files in one load/save cycle.
+
+        Args:
+            project_path: Project root directory
+            processed: (file_path, documents) pairs of processed files
+        """
+        if not processed:
+            return
+
+        metadata = self.load_metadata(project_path)
+
+        now = datetime.now().isoformat()
+        for file_path, documents in processed:
+            # A file deleted or renamed between parsing and this flush
+            # only drops its own entry; the rest of the batch still
+            # gets saved (it will be re-noticed as new if it returns)
+            try:
+                stat = file_path.stat()
+                file_hash = self.get_file_hash(file_path)
+            except OSError:
+                continue
+            metadata[str(file_path)] = {
+                "hash": file_hash,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "processed_at": now,
+                "chunk_count": len(documents),
+                "language": self.ocr_language
+            }
+
         self.save_metadata(project_path, metadata)
\ No newline at end of file
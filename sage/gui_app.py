@@ -4,6 +4,8 @@ import customtkinter as ctk
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import json
 import os
 import subprocess
@@ -11,14 +13,8 @@ import platform
 from datetime import datetime
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
-try:
-    import matplotlib.pyplot as plt
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkinter
-    import numpy as np
-    HAS_MATPLOTLIB = True
-except ImportError:
-    HAS_MATPLOTLIB = False
 
+from sage.cache import QueryCache
 from sage.config import ConfigManager, SageConfig
 from sage.file_processor import FileProcessor
 from sage.vector_store import VectorStore
@@ -28,11 +24,18 @@ from sage.model_manager import ModelManager
 
 class SageGUI:
     """Enhanced GUI for Project Sage with file browser and vector visualization."""
-    
+
+    # Rows fetched per page on the Vectors tab
+    VECTOR_PAGE = 50
+
     def __init__(self, project_path: Path):
         self.project_path = project_path
         self.config_manager = ConfigManager(project_path)
         self.config = self.config_manager.load()
+
+        # Prefix stripped from absolute paths for display; a string
+        # slice replaces Path.relative_to in the row/sample loops
+        self._project_prefix = str(project_path) + os.sep
         
         # Set appearance
         ctk.set_appearance_mode("system")
@@ -43,7 +46,51 @@ class SageGUI:
         self.root.title(f"Project Sage - {project_path.name}")
         self.root.geometry("1200x800")
         self.root.minsize(1000, 600)
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        # Single daemon worker serializing index updates, reindexes and
+        # vector-tab fetches; rapid clicks queue instead of racing on
+        # the vector store, and a daemon thread dies with the process
+        # instead of holding it open through a long OCR job on close
+        self._bg_queue = queue.Queue()
+        self._closing = False
+        self._bg_worker = threading.Thread(target=self._run_bg_jobs, daemon=True)
+        self._bg_worker.start()
+
+        # Status messages from worker threads; drained by a 100 ms
+        # poller instead of one after() callback per progress tick
+        self._status_q = queue.Queue()
         
+        # Metadata dict reused by the file filter between refreshes so
+        # keystrokes never hit the disk; repopulated by _load_data
+        self._metadata_cache: Dict[str, Dict] = {}
+
+        # Pending after() callback for the debounced file filter
+        self._filter_after_id = None
+
+        # Treeview item id per indexed file, so filtering can detach
+        # and reattach rows instead of destroying and recreating them
+        self._file_items: Dict[str, str] = {}
+
+        # Display fields per indexed file, precomputed once per
+        # metadata load; see _build_file_rows
+        self._file_rows: List[tuple] = []
+
+        # (chunks, last_mod) per file as currently shown, used to skip
+        # Treeview updates for rows that didn't change
+        self._file_sigs: Dict[str, tuple] = {}
+
+        # File sizes stat()ed on first selection, so arrow-keying
+        # through the tree doesn't re-stat the same files
+        self._file_sizes: Dict[str, int] = {}
+
+        # Generation counter for Vectors-tab refreshes; results arriving
+        # from a superseded refresh are dropped instead of applied
+        self._vector_refresh_gen = 0
+
+        # How many vector rows are currently shown (paging offset)
+        self._vector_offset = 0
+
         # Initialize components if configured
         self.file_processor = None
         self.vector_store = None
@@ -62,6 +109,7 @@ class SageGUI:
             
         self._create_widgets()
         self._load_data()
+        self.root.after(100, self._drain_status_queue)
         
     def _create_widgets(self):
         """Create all GUI widgets."""
@@ -268,11 +316,20 @@ class SageGUI:
         samples_frame.pack(fill="both", expand=True, padx=10, pady=10)
         
         ctk.CTkLabel(
-            samples_frame, 
+            samples_frame,
             text="Sample Document Chunks",
             font=ctk.CTkFont(size=16, weight="bold")
         ).pack(pady=5)
-        
+
+        # Packed before the tree so it keeps the bottom strip
+        self.vectors_load_more = ctk.CTkButton(
+            samples_frame,
+            text="Load More",
+            command=self._load_more_vectors,
+            width=100
+        )
+        self.vectors_load_more.pack(side="bottom", pady=5)
+
         # Create treeview for vectors
         vector_columns = ("ID", "Source", "Chunk", "Content Preview")
         self.vectors_tree = ttk.Treeview(samples_frame, columns=vector_columns, show="headings")
@@ -534,9 +591,12 @@ class SageGUI:
         if not self.config or not self.file_processor:
             return
             
-        # Load file metadata
+        # Load file metadata and keep it for the search filter
         metadata = self.file_processor.load_metadata(self.project_path)
-        
+        self._metadata_cache = metadata
+        # Sizes may have changed since the last index run
+        self._file_sizes.clear()
+
         # Update overview stats
         self.stats_labels["Files Indexed"].configure(text=str(len(metadata)))
         
@@ -547,10 +607,10 @@ class SageGUI:
             self.stats_labels["Total Chunks"].configure(text="0")
             
         if metadata:
-            last_update = max(
-                datetime.fromisoformat(m['processed_at']) 
-                for m in metadata.values()
-            )
+            # ISO-8601 strings sort chronologically, so take the max as
+            # text and parse only the winner
+            latest_iso = max(m['processed_at'] for m in metadata.values())
+            last_update = datetime.fromisoformat(latest_iso)
             self.stats_labels["Last Update"].configure(
                 text=last_update.strftime("%Y-%m-%d %H:%M:%S")
             )
@@ -558,23 +618,52 @@ class SageGUI:
             self.stats_labels["Last Update"].configure(text="Never")
             
         # Load files data
-        self._load_files_data(metadata)
-        
+        self._file_rows = self._build_file_rows(metadata)
+        self._load_files_data()
+
         # Load vector data
         self._load_vector_data()
         
-    def _load_files_data(self, metadata):
-        """Load files data into the tree view."""
-        # Clear existing data
-        for item in self.files_tree.get_children():
-            self.files_tree.delete(item)
-            
-        # Add files to tree
+    @staticmethod
+    def _tree_insert(tree, text, values):
+        """Append a Treeview row with a direct Tcl call.
+
+        The bulk loaders insert one row per indexed file/chunk;
+        bypassing ttk's Python-level option processing cuts the
+        per-row overhead to a single Tcl dispatch. Returns the new
+        item id, like Treeview.insert.
+        """
+        if text is None:
+            return tree.tk.call(tree._w, 'insert', '', 'end',
+                                '-values', values)
+        return tree.tk.call(tree._w, 'insert', '', 'end',
+                            '-text', text, '-values', values)
+
+    def _rel_display(self, file_path: str) -> str:
+        """Strip the project prefix from an absolute path for display.
+
+        Path.relative_to parses both paths into components on every
+        call; everything indexed lives under the project root, so a
+        startswith check and a slice give the same string. Paths from
+        elsewhere fall through unchanged.
+        """
+        if file_path.startswith(self._project_prefix):
+            return file_path[len(self._project_prefix):]
+        return file_path
+
+    def _build_file_rows(self, metadata):
+        """Precompute display fields for every indexed file.
+
+        Path splitting and timestamp formatting are pure-Python and were
+        repeated on every refresh; computing them once per metadata load
+        leaves the tree loader and the filter with plain tuple reads.
+        Each row is (file_path, rel_path, name, type, chunks, last_mod,
+        lower_path).
+        """
+        rows = []
         for file_path, file_meta in metadata.items():
-            rel_path = Path(file_path).relative_to(self.project_path)
-            file_name = Path(file_path).name
-            file_type = Path(file_path).suffix.upper()
-            chunks = str(file_meta.get('chunk_count', 0))
+            path = Path(file_path)
+            rel_path = self._rel_display(file_path)
             last_mod = file_meta.get('processed_at', 'Unknown')
             if last_mod != 'Unknown':
                 try:
@@ -582,87 +671,147 @@ class SageGUI:
                     last_mod = dt.strftime("%Y-%m-%d %H:%M")
                 except:
                     pass
-                    
-            status = "Indexed"
-            
-            self.files_tree.insert(
-                "", "end",
-                text=str(rel_path),
-                values=(file_name, file_type, chunks, last_mod, status)
-            )
+            rows.append((
+                file_path, rel_path, path.name, path.suffix.upper(),
+                str(file_meta.get('chunk_count', 0)), last_mod,
+                file_path.lower()
+            ))
+        return rows
+
+    def _load_files_data(self):
+        """Sync the files tree with the current rows.
+
+        After an incremental index update most rows are unchanged, so
+        instead of clearing and re-inserting everything this diffs
+        against what the tree already shows: new files are inserted,
+        removed files deleted, and only rows whose chunk count or
+        timestamp changed get their values rewritten.
+        """
+        current = {row[0] for row in self._file_rows}
+
+        # Drop rows for files that are no longer indexed
+        for file_path in list(self._file_items):
+            if file_path not in current:
+                self.files_tree.delete(self._file_items.pop(file_path))
+                self._file_sigs.pop(file_path, None)
+
+        for file_path, rel_path, name, file_type, chunks, last_mod, _ in self._file_rows:
+            sig = (chunks, last_mod)
+            item_id = self._file_items.get(file_path)
+            if item_id is None:
+                self._file_items[file_path] = self._tree_insert(
+                    self.files_tree, rel_path,
+                    (name, file_type, chunks, last_mod, "Indexed")
+                )
+            elif self._file_sigs.get(file_path) != sig:
+                self.files_tree.item(
+                    item_id,
+                    values=(name, file_type, chunks, last_mod, "Indexed")
+                )
+            self._file_sigs[file_path] = sig
+
+        # Keep an active search applied to the refreshed rows
+        if self.file_search.get():
+            self._do_filter_files()
             
     def _load_vector_data(self):
-        """Load vector database samples."""
+        """Refresh the Vectors tab without blocking the main loop.
+
+        Counting documents and sampling chunks run the embedding model
+        and Chroma queries, so they happen on a worker thread; only the
+        widget updates come back to the main thread via after().
+        """
         if not self.vector_store:
             return
-            
-        # Clear existing data
-        for item in self.vectors_tree.get_children():
-            self.vectors_tree.delete(item)
-            
-        # Update vector stats
+
+        self._vector_refresh_gen += 1
+        self._submit_bg(self._fetch_vector_samples, self._vector_refresh_gen, 0)
+
+    def _load_more_vectors(self):
+        """Append the next page of chunks to the Vectors tab."""
+        if not self.vector_store:
+            return
+
+        self._vector_refresh_gen += 1
+        self._submit_bg(self._fetch_vector_samples, self._vector_refresh_gen,
+                        self._vector_offset)
+
+    def _fetch_vector_samples(self, gen, offset):
+        """Worker half of the Vectors-tab refresh: query and format."""
         doc_count = self.vector_store.get_document_count()
         stats_text = f"Total Documents: {doc_count}\n"
         stats_text += f"Embedding Model: {self.config.embedding_model}\n"
         stats_text += f"Vector Database: ChromaDB (Local)\n"
         stats_text += f"Database Path: {self.config_manager.get_db_path()}"
-        
-        self.vector_stats.delete("1.0", "end")
-        self.vector_stats.insert("1.0", stats_text)
-        
-        # Get sample documents from vector store
+
+        # Get one page of stored chunks from the vector store
+        rows = []
         try:
-            if doc_count > 0:
-                # Try to get some sample documents
-                sample_docs = self.vector_store.search("example", k=min(20, doc_count))
-                
-                for i, doc in enumerate(sample_docs):
+            if doc_count > offset:
+                sample_docs = self.vector_store.peek(self.VECTOR_PAGE, offset=offset)
+
+                for i, doc in enumerate(sample_docs, offset):
                     source = doc.metadata.get('source', 'Unknown')
-                    rel_source = str(Path(source).relative_to(self.project_path)) if source != 'Unknown' else 'Unknown'
+                    rel_source = self._rel_display(source) if source != 'Unknown' else 'Unknown'
                     chunk_idx = doc.metadata.get('chunk_index', 0)
                     content_preview = doc.page_content[:100] + "..." if len(doc.page_content) > 100 else doc.page_content
-                    
-                    self.vectors_tree.insert(
-                        "", "end",
-                        values=(f"chunk_{i}", rel_source, str(chunk_idx + 1), content_preview)
+                    rows.append(
+                        (f"chunk_{i}", rel_source, str(chunk_idx + 1), content_preview)
                     )
         except Exception as e:
             print(f"Error loading vector samples: {e}")
+
+        self.root.after(
+            0, lambda: self._apply_vector_samples(gen, stats_text, rows,
+                                                  offset, doc_count)
+        )
+
+    def _apply_vector_samples(self, gen, stats_text, rows, offset, doc_count):
+        """Main-thread half of the Vectors-tab refresh: populate widgets."""
+        if gen != self._vector_refresh_gen:
+            # A newer refresh is already in flight; don't flash stale data
+            return
+
+        if offset == 0:
+            for item in self.vectors_tree.get_children():
+                self.vectors_tree.delete(item)
+
+        self.vector_stats.delete("1.0", "end")
+        self.vector_stats.insert("1.0", stats_text)
+
+        for row in rows:
+            self._tree_insert(self.vectors_tree, None, row)
+
+        self._vector_offset = offset + len(rows)
+        if hasattr(self, 'vectors_load_more'):
+            state = "normal" if self._vector_offset < doc_count else "disabled"
+            self.vectors_load_more.configure(state=state)
             
     def _filter_files(self, event):
-        """Filter files based on search term."""
+        """Debounce filtering so a typing burst rebuilds the tree once."""
+        if self._filter_after_id is not None:
+            self.root.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.root.after(200, self._do_filter_files)
+
+    def _do_filter_files(self):
+        """Filter files based on search term.
+
+        Rows are detached and reattached rather than deleted and
+        re-inserted: the existing Treeview items carry all their data
+        already, so filtering is a membership test per file instead of
+        widget construction per match.
+        """
+        self._filter_after_id = None
         search_term = self.file_search.get().lower()
-        
-        # Clear and reload with filter
-        for item in self.files_tree.get_children():
-            self.files_tree.delete(item)
-            
-        if not self.file_processor:
-            return
-            
-        metadata = self.file_processor.load_metadata(self.project_path)
-        
-        for file_path, file_meta in metadata.items():
-            if search_term in file_path.lower():
-                rel_path = Path(file_path).relative_to(self.project_path)
-                file_name = Path(file_path).name
-                file_type = Path(file_path).suffix.upper()
-                chunks = str(file_meta.get('chunk_count', 0))
-                last_mod = file_meta.get('processed_at', 'Unknown')
-                if last_mod != 'Unknown':
-                    try:
-                        dt = datetime.fromisoformat(last_mod)
-                        last_mod = dt.strftime("%Y-%m-%d %H:%M")
-                    except:
-                        pass
-                        
-                status = "Indexed"
-                
-                self.files_tree.insert(
-                    "", "end",
-                    text=str(rel_path),
-                    values=(file_name, file_type, chunks, last_mod, status)
-                )
+
+        for row in self._file_rows:
+            item_id = self._file_items.get(row[0])
+            if item_id is None:
+                continue
+            if search_term in row[6]:  # precomputed lowered path
+                self.files_tree.move(item_id, '', 'end')
+            else:
+                self.files_tree.detach(item_id)
                 
     def _on_file_select(self, event):
         """Handle file selection in tree view."""
@@ -682,11 +831,15 @@ class SageGUI:
         details += f"Last Modified: {item['values'][3]}\n"
         details += f"Status: {item['values'][4]}\n"
         
-        # Try to get actual file info
+        # Try to get actual file info; stat each file once per refresh
         try:
-            full_path = self.project_path / file_path
-            if full_path.exists():
-                size = full_path.stat().st_size
+            size = self._file_sizes.get(file_path)
+            if size is None:
+                full_path = self.project_path / file_path
+                if full_path.exists():
+                    size = full_path.stat().st_size
+                    self._file_sizes[file_path] = size
+            if size is not None:
                 details += f"Size: {size:,} bytes\n"
         except:
             pass
@@ -799,7 +952,7 @@ class SageGUI:
             
         def reindex_thread():
             try:
-                self.root.after(0, lambda: self._show_status(f"🔄 Reindexing {file_path.name}..."))
+                self._status_q.put(f"🔄 Reindexing {file_path.name}...")
                 
                 # Process the file
                 documents = self.file_processor.process_file(file_path)
@@ -807,18 +960,22 @@ class SageGUI:
                     # Remove old chunks for this file first (simplified approach)
                     self.vector_store.add_documents(documents)
                     self.file_processor.update_metadata(self.project_path, file_path, documents)
-                    
-                    status = f"✅ Reindexed {file_path.name} - {len(documents)} chunks"
-                    self.root.after(0, lambda: self._show_status(status))
+
+                    # Cached query/answer results may reference stale chunks now
+                    QueryCache(self.project_path).clear()
+
+
+                    self._status_q.put(
+                        f"✅ Reindexed {file_path.name} - {len(documents)} chunks"
+                    )
                     self.root.after(0, self._load_data)
                 else:
-                    self.root.after(0, lambda: self._show_status(f"❌ Failed to reindex {file_path.name}"))
+                    self._status_q.put(f"❌ Failed to reindex {file_path.name}")
                     
             except Exception as e:
-                error_msg = f"❌ Error reindexing {file_path.name}: {str(e)}"
-                self.root.after(0, lambda: self._show_status(error_msg))
+                self._status_q.put(f"❌ Error reindexing {file_path.name}: {str(e)}")
                 
-        threading.Thread(target=reindex_thread, daemon=True).start()
+        self._submit_bg(reindex_thread)
         
     def _on_vector_select(self, event):
         """Handle vector selection in tree view."""
@@ -848,40 +1005,85 @@ class SageGUI:
             try:
                 # Update status
                 action = "Force reindexing" if force else "Updating index"
-                self.root.after(0, lambda: self._show_status(f"{action}..."))
+                self._status_q.put(f"{action}...")
                 
                 # Find files to process
                 files_to_process = self.file_processor.find_files(self.project_path, force)
                 
                 if not files_to_process:
-                    self.root.after(0, lambda: self._show_status("No files to process. Knowledge base is up to date."))
+                    self._status_q.put("No files to process. Knowledge base is up to date.")
                     return
                 
                 if force:
                     self.vector_store.clear()
                     
-                # Process files
+                # Process files concurrently; parsing and OCR release
+                # the GIL in their C libraries, so a thread per core
+                # overlaps their latency. Chroma writes stay in this
+                # thread, one file at a time, as results complete.
                 total_documents = 0
                 processed_files = 0
-                
-                for i, file_path in enumerate(files_to_process):
-                    try:
-                        # Update progress
-                        progress = f"Processing {file_path.name} ({i+1}/{len(files_to_process)})"
-                        self.root.after(0, lambda p=progress: self._show_status(p))
-                        
-                        documents = self.file_processor.process_file(file_path)
+                total = len(files_to_process)
+
+                # Accumulate chunks across files and flush in batches;
+                # the embedder runs faster on larger inputs and each
+                # add_documents call is a separate Chroma transaction.
+                # Metadata is written with the same flush, so it only
+                # ever records chunks that actually got committed.
+                batch_size = 256
+                pending = []
+                pending_files = []
+
+                def _flush():
+                    self.vector_store.add_documents(pending)
+                    self.file_processor.update_metadata_batch(
+                        self.project_path, pending_files
+                    )
+                    pending.clear()
+                    pending_files.clear()
+
+                with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as pool:
+                    futures = {
+                        pool.submit(self.file_processor.process_file, fp): fp
+                        for fp in files_to_process
+                    }
+                    for done, future in enumerate(as_completed(futures), 1):
+                        if self._closing:
+                            # Abandon queued files; only parses already
+                            # in flight run to completion
+                            pool.shutdown(wait=False, cancel_futures=True)
+                            return
+
+                        file_path = futures[future]
+                        try:
+                            documents = future.result()
+                        except Exception as e:
+                            print(f"Error processing {file_path}: {e}")
+                            continue
+
+                        self._status_q.put(
+                            f"Processed {file_path.name} ({done}/{total})"
+                        )
+
                         if documents:
-                            self.vector_store.add_documents(documents)
-                            self.file_processor.update_metadata(self.project_path, file_path, documents)
+                            pending.extend(documents)
+                            pending_files.append((file_path, documents))
                             total_documents += len(documents)
                             processed_files += 1
-                    except Exception as e:
-                        print(f"Error processing {file_path}: {e}")
-                        
+                            if len(pending) >= batch_size:
+                                _flush()
+
+                if pending:
+                    _flush()
+
+                # Cached query/answer results may reference stale chunks now
+                QueryCache(self.project_path).clear()
+
                 # Final status
-                status = f"✅ Processed {processed_files} files, created {total_documents} document chunks"
-                self.root.after(0, lambda: self._show_status(status))
+                self._status_q.put(
+                    f"✅ Processed {processed_files} files, "
+                    f"created {total_documents} document chunks"
+                )
                         
                 # Refresh UI
                 self.root.after(0, self._load_data)
@@ -889,9 +1091,9 @@ class SageGUI:
             except Exception as e:
                 error_msg = f"❌ Update error: {str(e)}"
                 print(error_msg)
-                self.root.after(0, lambda: self._show_status(error_msg))
+                self._status_q.put(error_msg)
                 
-        threading.Thread(target=update_thread, daemon=True).start()
+        self._submit_bg(update_thread)
         
     def _show_status(self, message):
         """Show status message in the overview tab."""
@@ -899,6 +1101,24 @@ class SageGUI:
             self.status_label.configure(text=message)
         else:
             print(f"Status: {message}")
+
+    def _drain_status_queue(self):
+        """Display the newest queued status message.
+
+        Workers put() freely at their own pace; this poller empties the
+        queue and shows only the last message, so a burst of progress
+        ticks costs one label update instead of one after() dispatch
+        per tick.
+        """
+        message = None
+        while True:
+            try:
+                message = self._status_q.get_nowait()
+            except queue.Empty:
+                break
+        if message is not None:
+            self._show_status(message)
+        self.root.after(100, self._drain_status_queue)
         
     # Chat functionality methods
     def _get_current_model_status(self):
@@ -1426,6 +1646,24 @@ class SageGUI:
         # Update status
         self._update_model_status()
         
+    def _submit_bg(self, fn, *args):
+        """Queue a job for the background worker."""
+        self._bg_queue.put((fn, args))
+
+    def _run_bg_jobs(self):
+        """Daemon loop running queued background jobs one at a time."""
+        while True:
+            fn, args = self._bg_queue.get()
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"Background task error: {e}")
+
+    def _on_close(self):
+        """Tear down the window; the daemon worker dies with the process."""
+        self._closing = True
+        self.root.destroy()
+
     def run(self):
         """Run the GUI application."""
         self.root.mainloop()
@@ -1,5 +1,6 @@
 """Model management for dynamic LLM switching in Project Sage."""
 
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 from pydantic import SecretStr
 from sage.config import SageConfig
@@ -75,7 +76,22 @@ class ModelManager:
     def get_available_models(self) -> Dict[str, List[str]]:
         """Get all available models organized by provider."""
         return self.AVAILABLE_MODELS.copy()
-        
+
+    def _invalidate(self):
+        """Drop memoized views so they rebuild on next access.
+
+        The views below (@lru_cache'd methods) derive from the config
+        and static tables; /model and /status call them every time, so
+        they are memoized and cleared here whenever state changes.
+        """
+        for method in (self.get_configured_providers,
+                       self.list_available_models,
+                       self.get_recommended_models,
+                       self.get_detailed_recommendations):
+            method.cache_clear()
+
+
+    @lru_cache(maxsize=None)
     def get_configured_providers(self) -> List[str]:
         """Get list of providers that have API keys configured."""
         providers = []
@@ -152,11 +168,13 @@ class ModelManager:
             self.config.current_chat_provider = provider
             self.config.current_chat_model = model
             
-            # Clear cached client to force recreation
+            # Clear cached client and memoized views to force recreation
             client_key = f"{provider}:{model}"
             if client_key in self.active_clients:
                 del self.active_clients[client_key]
-                
+            self._invalidate()
+
+
             return True
             
         except Exception as e:
@@ -173,7 +191,7 @@ class ModelManager:
         
         if client_key not in self.active_clients:
             # Create a temporary config for this specific model
-            temp_config = self.config.copy()
+            temp_config = self.config.model_copy()
             temp_config.llm_provider = self.current_provider
             temp_config.llm_model = self.current_model
             
@@ -186,6 +204,7 @@ class ModelManager:
             
         return self.active_clients[client_key]
         
+    @lru_cache(maxsize=None)
     def list_available_models(self) -> List[Tuple[str, str, bool]]:
         """List all available models with their availability status."""
         models = []
@@ -232,6 +251,7 @@ class ModelManager:
         
         return descriptions.get((provider, model), f"📋 {provider.title()} model")
         
+    @lru_cache(maxsize=None)
     def get_recommended_models(self) -> Dict[str, Tuple[str, str]]:
         """Get recommended models for different use cases."""
         configured = self.get_configured_providers()
@@ -308,6 +328,7 @@ class ModelManager:
         }
         return embedding_info.get(provider, "Unknown embedding model")
     
+    @lru_cache(maxsize=None)
     def get_switching_tips(self) -> List[str]:
         """Get tips for effective model switching."""
         return [
@@ -320,6 +341,7 @@ class ModelManager:
             "💰 Local Ollama models have no ongoing costs after setup"
         ]
     
+    @lru_cache(maxsize=None)
     def get_detailed_recommendations(self) -> Dict[str, Dict[str, str]]:
         """Get detailed recommendations with explanations."""
         configured = self.get_configured_providers()
@@ -341,6 +363,7 @@ class ModelManager:
             
         return detailed
 
+    @lru_cache(maxsize=None)
     def get_provider_comparison(self) -> Dict[str, Dict[str, str]]:
         """Get comparison of all providers."""
         return {
@@ -1,7 +1,9 @@
 """Vector database management for Project Sage."""
 
+from collections import OrderedDict
 from pathlib import Path
 from typing import List, Optional, Dict, Any
+import numpy as np
 import chromadb
 from chromadb.config import Settings
 from langchain.schema import Document
@@ -22,15 +24,49 @@ except ImportError:
     HAS_HUGGINGFACE = False
 
 
+# Initialized stores keyed by (db path, index provider, index model);
+# see get_vector_store below
+_STORES: Dict[tuple, "VectorStore"] = {}
+
+
+def get_vector_store(config) -> "VectorStore":
+    """Return an initialized VectorStore, one per database per process.
+
+    Construction loads the embeddings client and opens the Chroma
+    collection, which is pure overhead to repeat; commands and the GUI
+    all go through here so a second lookup in the same process reuses
+    the first instance (and its query caches).
+    """
+    index_provider, index_model = config.get_index_provider_model()
+    key = (str(config.project_path / ".sage/db"), index_provider, index_model)
+    store = _STORES.get(key)
+    if store is None:
+        store = VectorStore(config)
+        store.initialize()
+        _STORES[key] = store
+    return store
+
+
 class VectorStore:
     """Manages the vector database for document storage and retrieval."""
-    
+
+    # Maximum number of query embeddings kept in the LRU cache
+    QUERY_CACHE_SIZE = 1024
+
+    # Semantic result cache: queries whose embeddings are this close to
+    # an earlier query reuse its results without touching the ANN index
+    SEMANTIC_CACHE_SIZE = 256
+    SEMANTIC_SIM_THRESHOLD = 0.95
+
     def __init__(self, config):
         self.config = config
         self.db_path = config.project_path / ".sage/db"
         self.embeddings = self._get_embeddings()
         self.vectorstore = None
-        
+        self._query_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._semantic_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._count_cache: Optional[int] = None
+
     def _get_embeddings(self):
         """Get the appropriate embeddings model based on provider."""
         # Use index provider and API key for embeddings
@@ -111,6 +147,12 @@ class VectorStore:
             
         if documents:
             self.vectorstore.add_documents(documents)
+            if self._count_cache is not None:
+                self._count_cache += len(documents)
+            # Cached search results predate the new chunks; stores are
+            # process-lived (see get_vector_store), so without this a
+            # GUI session keeps serving pre-write results
+            self._semantic_cache.clear()
             
     def clear(self):
         """Clear all documents from the vector store."""
@@ -120,25 +162,165 @@ class VectorStore:
             all_ids = collection.get()['ids']
             if all_ids:
                 collection.delete(ids=all_ids)
+        # Cached results reference deleted chunks; query embeddings
+        # stay valid since they depend only on the query text
+        self._semantic_cache.clear()
+        self._count_cache = 0
                 
+    def _embed_query_cached(self, query: str) -> List[float]:
+        """Embed a query, reusing cached vectors for repeat queries.
+
+        Embeddings are pure functions of the input text, so repeat
+        queries skip the encoder round-trip entirely.
+        """
+        cached = self._query_cache.get(query)
+        if cached is not None:
+            self._query_cache.move_to_end(query)
+            return cached
+
+        vector = self.embeddings.embed_query(query)
+        self._cache_query_vector(query, vector)
+        return vector
+
+    def _cache_query_vector(self, query: str, vector: List[float]):
+        """Store a query vector, evicting the least recently used entry."""
+        self._query_cache[query] = vector
+        if len(self._query_cache) > self.QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+
+    def _semantic_lookup(self, vector: List[float], k: int) -> Optional[List[Document]]:
+        """Return cached results for a semantically equivalent query.
+
+        Rephrasings of earlier questions embed close together; one
+        matmul over the cached unit vectors finds the nearest prior
+        query, and anything above SEMANTIC_SIM_THRESHOLD reuses its
+        results without a Chroma round-trip.
+        """
+        candidates = [
+            (key, vec, docs)
+            for key, (vec, cached_k, docs) in self._semantic_cache.items()
+            if cached_k == k
+        ]
+        if not candidates:
+            return None
+
+        query_vec = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query_vec)
+        if norm:
+            query_vec = query_vec / norm
+
+        sims = np.stack([vec for _, vec, _ in candidates]) @ query_vec
+        best = int(np.argmax(sims))
+        if sims[best] < self.SEMANTIC_SIM_THRESHOLD:
+            return None
+
+        self._semantic_cache.move_to_end(candidates[best][0])
+        return candidates[best][2]
+
+    def _semantic_store(self, query: str, vector: List[float], k: int,
+                        documents: List[Document]):
+        """Record search results for semantic reuse, evicting LRU-first."""
+        unit = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(unit)
+        if norm:
+            unit = unit / norm
+        self._semantic_cache[(query, k)] = (unit, k, documents)
+        if len(self._semantic_cache) > self.SEMANTIC_CACHE_SIZE:
+            self._semantic_cache.popitem(last=False)
+
     def search(self, query: str, k: int = 5) -> List[Document]:
         """Search for relevant documents."""
         if not self.vectorstore:
             self.initialize()
-            
-        return self.vectorstore.similarity_search(query, k=k)
-        
+
+        vector = self._embed_query_cached(query)
+        cached = self._semantic_lookup(vector, k)
+        if cached is not None:
+            return cached
+
+        documents = self.vectorstore.similarity_search_by_vector(vector, k=k)
+        self._semantic_store(query, vector, k, documents)
+        return documents
+
+    def search_batch(self, queries: List[str], k: int = 5) -> List[List[Document]]:
+        """Search for relevant documents for multiple queries at once.
+
+        Embeds all uncached queries in a single request, then runs one
+        vector search per embedding, avoiding a round-trip per query.
+        """
+        if not self.vectorstore:
+            self.initialize()
+
+        if not queries:
+            return []
+
+        # Batch embeddings go through embed_documents, whose vectors
+        # are not interchangeable with embed_query output on providers
+        # with asymmetric query/document modes (e.g. Google's task
+        # types). They stay local to this call rather than entering the
+        # shared query cache, where search() would later reuse them.
+        vectors = {
+            q: self._query_cache[q] for q in queries if q in self._query_cache
+        }
+        misses = [q for q in queries if q not in vectors]
+        if misses:
+            for q, vector in zip(misses, self.embeddings.embed_documents(misses)):
+                vectors[q] = vector
+
+        return [
+            self.vectorstore.similarity_search_by_vector(vectors[q], k=k)
+            for q in queries
+        ]
+
     def search_with_score(self, query: str, k: int = 5) -> List[tuple]:
         """Search for relevant documents with relevance scores."""
         if not self.vectorstore:
             self.initialize()
-            
+
         return self.vectorstore.similarity_search_with_score(query, k=k)
+
+    def search_with_diversity(self, query: str, k: int = 5, fetch_k: int = 20,
+                              lambda_mult: float = 0.5) -> List[Document]:
+        """Search for relevant documents re-ranked for diversity (MMR).
+
+        Maximal Marginal Relevance runs inside the vector backend, so
+        diversity is computed in one vectorized pass instead of
+        filtering over-fetched results in Python.
+        """
+        if not self.vectorstore:
+            self.initialize()
+
+        return self.vectorstore.max_marginal_relevance_search_by_vector(
+            self._embed_query_cached(query), k=k, fetch_k=fetch_k,
+            lambda_mult=lambda_mult
+        )
         
-    def get_document_count(self) -> int:
-        """Get the total number of documents in the store."""
+    def peek(self, n: int = 20, offset: int = 0) -> List[Document]:
+        """Return up to n stored chunks without running a search.
+
+        Sampling via search() embeds a throwaway query and walks the ANN
+        index just to discard the ranking; a plain collection get reads
+        the rows straight out of storage.
+        """
         if not self.vectorstore:
             self.initialize()
-            
-        collection = self.vectorstore._collection
-        return collection.count()
\ No newline at end of file
+
+        result = self.vectorstore._collection.get(
+            limit=n, offset=offset, include=['metadatas', 'documents']
+        )
+        return [
+            Document(page_content=content, metadata=meta or {})
+            for content, meta in zip(result['documents'], result['metadatas'])
+        ]
+
+    def get_document_count(self) -> int:
+        """Get the total number of documents in the store.
+
+        The count is cached and maintained by add_documents/clear, so
+        the repeated calls a GUI refresh makes hit Chroma only once.
+        """
+        if self._count_cache is None:
+            if not self.vectorstore:
+                self.initialize()
+            self._count_cache = self.vectorstore._collection.count()
+        return self._count_cache
\ No newline at end of file
@@ -47,7 +47,7 @@ setup(
     ],
     entry_points={
         "console_scripts": [
-            "sage=sage.cli:main",
+            "sage=sage.__main__:main",
         ],
     },
 )
\ No newline at end of file
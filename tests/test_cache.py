@@ -0,0 +1,64 @@
+"""Test the client-side query/answer cache."""
+
+import tempfile
+from pathlib import Path
+
+from langchain.schema import Document
+
+from sage.cache import (
+    QueryCache,
+    answer_key,
+    decode_documents,
+    encode_documents,
+    query_key,
+)
+
+
+def test_query_cache_round_trip():
+    """put/get/clear against the on-disk cache."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = QueryCache(Path(temp_dir))
+        key = query_key("what is the project budget?", 5)
+
+        assert cache.get(key) is None
+
+        cache.put(key, b"cached value")
+        assert cache.get(key) == b"cached value"
+
+        # A fresh instance sees the same entry (it's on disk)
+        assert QueryCache(Path(temp_dir)).get(key) == b"cached value"
+
+        cache.clear()
+        assert cache.get(key) is None
+
+
+def test_query_key_varies_with_inputs():
+    """Different queries or k values never collide."""
+    assert query_key("a question", 5) != query_key("a question", 10)
+    assert query_key("a question", 5) != query_key("another question", 5)
+
+
+def test_document_round_trip():
+    """Documents survive encode/decode with content and metadata intact."""
+    docs = [
+        Document(page_content="chunk text",
+                 metadata={"source": "a.txt", "chunk_index": 0}),
+        Document(page_content="more text",
+                 metadata={"source": "b.txt", "chunk_index": 3}),
+    ]
+
+    restored = decode_documents(encode_documents(docs))
+
+    assert [d.page_content for d in restored] == ["chunk text", "more text"]
+    assert restored[0].metadata["source"] == "a.txt"
+    assert restored[1].metadata["chunk_index"] == 3
+
+
+def test_answer_key_tied_to_chunks_and_model():
+    """The answer key changes when the model or retrieved chunks change."""
+    docs = [Document(page_content="x", metadata={"source": "a.txt", "chunk_index": 0})]
+    other = [Document(page_content="x", metadata={"source": "a.txt", "chunk_index": 1})]
+
+    base = answer_key("a question", "google:gemini-1.5-flash", docs)
+    assert base != answer_key("a question", "openai:gpt-4o", docs)
+    assert base != answer_key("a question", "google:gemini-1.5-flash", other)
@@ -0,0 +1,63 @@
+"""Test file change detection in FileProcessor."""
+
+import os
+import tempfile
+from pathlib import Path
+
+from sage.file_processor import FileProcessor
+
+
+def test_iter_files_change_detection():
+    """New, unchanged, touched and modified files are classified correctly."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        project_path = Path(temp_dir)
+        file_path = project_path / "doc.txt"
+        file_path.write_text("original content")
+
+        processor = FileProcessor()
+
+        # A file with no metadata is new and gets yielded
+        assert list(processor.iter_files(project_path)) == [file_path]
+
+        processor.update_metadata_batch(project_path, [(file_path, [])])
+
+        # Unchanged file: the (mtime, size) fingerprint skips it
+        # without hashing
+        assert list(processor.iter_files(project_path)) == []
+
+        # Touched but identical: the fingerprint misses, the deferred
+        # hash comparison confirms the content and still skips it
+        stat = file_path.stat()
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+        assert list(processor.iter_files(project_path)) == []
+
+        # Same length, different bytes: only the hash can tell, and the
+        # file is yielded for reprocessing
+        file_path.write_text("modified content")
+        assert list(processor.iter_files(project_path)) == [file_path]
+
+
+def test_iter_files_force_rescans_everything():
+    """force=True ignores recorded metadata entirely."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        project_path = Path(temp_dir)
+        file_path = project_path / "doc.txt"
+        file_path.write_text("original content")
+
+        processor = FileProcessor()
+        processor.update_metadata_batch(project_path, [(file_path, [])])
+
+        assert list(processor.iter_files(project_path, force=True)) == [file_path]
+
+
+def test_iter_files_prunes_excluded_dirs():
+    """Files under excluded directories never surface."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        project_path = Path(temp_dir)
+        hidden = project_path / ".sage"
+        hidden.mkdir()
+        (hidden / "internal.txt").write_text("not a document")
+        (project_path / "doc.txt").write_text("a document")
+
+        processor = FileProcessor()
+        assert list(processor.iter_files(project_path)) == [project_path / "doc.txt"]
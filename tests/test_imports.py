@@ -0,0 +1,19 @@
+"""Test that importing the CLI keeps the import surface lean."""
+
+import sys
+
+
+def test_cli_import_skips_gui_dependencies():
+    """Importing sage.cli must not pull in matplotlib or tkinter."""
+    import sage.cli  # noqa: F401
+
+    assert "matplotlib" not in sys.modules
+    assert "tkinter" not in sys.modules
+
+
+def test_cli_import_skips_heavy_subsystems():
+    """Heavy subsystems load inside commands, not at import time."""
+    import sage.cli  # noqa: F401
+
+    assert "sage.gui_app" not in sys.modules
+    assert "sage.setup_gui" not in sys.modules